@@ -15,18 +15,79 @@ import calendar
 from datetime import date as basedate
 from datetime import datetime as basedatetime
 from datetime import time as basetime
-
-from bdateutil.parser import parse
-from bdateutil.relativedelta import relativedelta
+from datetime import timedelta
+
+from bdateutil.bcalendar import BusinessCalendar
+from bdateutil.bcalendar import FrozenHolidays, freeze_holidays
+from bdateutil.bcalendar import _convention, _nth_bday, _roll, _weekmask
+from bdateutil.parser import parse, parse_many
+from bdateutil.relativedelta import BusinessDuration, relativedelta
+from bdateutil.relativedelta import _Sessions, _btime
 from bdateutil.relativedelta import MO, TU, WE, TH, FR, SA, SU
 from bdateutil.rrule import *
+from bdateutil.vectorized import add_business_time, business_seconds_array
+from bdateutil.vectorized import isbday_array, roll_array
+from bdateutil.vectorized import add_bdays, count_bdays, sub_bdays
 
 
-def isbday(dt, holidays=None):
+def isbday(dt, holidays=None, weekmask=None):
     if holidays is None:
         holidays = getattr(isbday, 'holidays', ())
+    if weekmask is None:
+        weekmask = getattr(isbday, 'weekmask', None)
+    dt = parse(dt)
+    if isinstance(holidays, BusinessCalendar):
+        return holidays.isbday(dt)
+    return _weekmask(weekmask)[dt.weekday()] and dt not in holidays
+
+
+def roll(dt, convention='following', holidays=None, weekmask=None):
+    if holidays is None:
+        holidays = getattr(roll, 'holidays', ())
+    if weekmask is None:
+        weekmask = getattr(roll, 'weekmask', None)
+    if isinstance(dt, (list, tuple)) or hasattr(dt, 'dtype'):
+        return roll_array(dt, convention, holidays, weekmask)
     dt = parse(dt)
-    return not (dt.weekday() in (5, 6) or dt in holidays)
+    o = dt.toordinal()
+    return dt + timedelta(days=_roll(o, _convention(convention), holidays,
+                                     _weekmask(weekmask)) - o)
+
+
+def nth_bday(year, month, n, holidays=None, weekmask=None):
+    if holidays is None:
+        holidays = getattr(nth_bday, 'holidays', ())
+    if weekmask is None:
+        weekmask = getattr(nth_bday, 'weekmask', None)
+    o = _nth_bday(year, month, n, holidays, _weekmask(weekmask))
+    if o is None:
+        raise ValueError("%d-%02d has no business day %d"
+                         % (year, month, n))
+    return date.fromordinal(o)
+
+
+def business_seconds(start, end, holidays=None, weekmask=None, btstart=None,
+                     btend=None, sessions=None):
+    if holidays is None:
+        holidays = getattr(business_seconds, 'holidays', ())
+    if weekmask is None:
+        weekmask = getattr(business_seconds, 'weekmask', None)
+    if any(isinstance(dt, (list, tuple)) or hasattr(dt, 'dtype')
+           for dt in (start, end)):
+        return business_seconds_array(start, end, holidays, weekmask,
+                                      btstart, btend, sessions)
+    if btstart is None:
+        btstart = basetime(9)
+    if btend is None:
+        btend = basetime(17)
+    start, end = parse(start), parse(end)
+    if not isinstance(start, basedatetime):
+        start = basedatetime.combine(start, basetime())
+    if not isinstance(end, basedatetime):
+        end = basedatetime.combine(end, basetime())
+    us = _btime(start, end, holidays, _weekmask(weekmask, holidays),
+                _Sessions(sessions, btstart, btend, holidays))
+    return us // 1000000 if us >= 0 else -(-us // 1000000)
 
 
 class date(basedate):
@@ -0,0 +1,516 @@
+#  bdateutil
+#  -----------
+#  Adds business day logic and improved data type flexibility to
+#  python-dateutil. 100% backwards compatible with python-dateutil,
+#  simply replace dateutil imports with bdateutil.
+#
+#  Author:  ryanss <ryanssdev@icloud.com>
+#  Website: https://github.com/ryanss/bdateutil
+#  License: MIT (see LICENSE file)
+
+
+from array import array
+import binascii
+from bisect import bisect_left, bisect_right
+import calendar
+from datetime import date, datetime
+
+import six
+
+from bdateutil.parser import parse
+
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+WEEKMASK = (True, True, True, True, True, False, False)
+CONVENTIONS = ('following', 'modifiedfollowing', 'preceding',
+               'modifiedpreceding')
+
+_DAY = 24 * 60 * 60 * 1000000
+
+
+def _weekmask(weekmask, holidays=None):
+    """Return weekmask as a tuple of seven booleans starting on Monday.
+    Accepts a string of seven 0s and 1s such as '1111100', a string of
+    weekday names such as 'Mon Tue Wed Thu Fri' or a sequence of seven
+    values. Defaults to the weekmask of holidays if it is a BusinessCalendar
+    and Monday to Friday otherwise."""
+    if weekmask is None:
+        return getattr(holidays, 'weekmask', WEEKMASK)
+    if isinstance(weekmask, six.string_types):
+        if len(weekmask) == 7 and not weekmask.strip('01'):
+            weekmask = [c == '1' for c in weekmask]
+        else:
+            days = [day[:3].lower() for day in weekmask.split()]
+            if not set(days) <= set(WEEKDAYS):
+                raise ValueError("Invalid weekmask '%s'" % weekmask)
+            weekmask = [day in days for day in WEEKDAYS]
+    weekmask = tuple(bool(day) for day in weekmask)
+    if len(weekmask) != 7:
+        raise ValueError("A weekmask must have seven days")
+    if not any(weekmask):
+        raise ValueError("A weekmask must have at least one business day")
+    return weekmask
+
+
+def _toordinal(dt):
+    """Return the ordinal of the date of dt, which is parsed if needed."""
+    if not isinstance(dt, date):
+        dt = parse(dt)
+    if isinstance(dt, datetime):
+        dt = dt.date()
+    return dt.toordinal()
+
+
+def _microseconds(t):
+    """Return the number of microseconds between midnight and the time t."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 + \
+        t.microsecond
+
+
+def _compile_sessions(sessions):
+    """Return business hours given as a list of (start, end) times as the
+    sorted start and end times of the sessions in microseconds since
+    midnight along with the business time elapsed at the start of each
+    session and at the end of the last. A session ending at or before its
+    start time wraps midnight and ends on the next day."""
+    starts, ends, totals = [], [], [0]
+    for start, end in sorted((_microseconds(s), _microseconds(e))
+                             for s, e in sessions):
+        if end <= start:
+            end += _DAY
+        if ends and start < ends[-1]:
+            raise ValueError("Business hours sessions must not overlap")
+        starts.append(start)
+        ends.append(end)
+        totals.append(totals[-1] + end - start)
+    return starts, ends, totals
+
+
+def _overlaps(day, next_day):
+    """Return whether the compiled sessions day run past the start of the
+    compiled sessions next_day of the day after."""
+    ends, starts = day[1], next_day[0]
+    return bool(ends and starts and ends[-1] > starts[0] + _DAY)
+
+
+# Sorted holiday ordinals of the immutable collections and holidays objects
+# used lately, keyed by id. Each entry keeps the object itself so its id
+# can't be reused, its length, the years populated in it and the ordinals
+# for each weekmask.
+_sorted_holidays_cache = {}
+_SORTED_HOLIDAYS_CACHE_SIZE = 64
+
+
+def _sorted_holidays(holidays, first, last, weekmask=WEEKMASK):
+    """Return the sorted ordinals of the holidays of holidays, a holidays
+    object or any collection of dates, falling on a day of the weekmask and
+    including at least those between the ordinals first and last.
+
+    The ordinals of tuples, frozensets and FrozenHolidays are kept since
+    they can't change. Those of a holidays.HolidayBase are kept until its
+    length changes or years beyond those populated in it are needed. Any
+    other collection can be edited in place so its holidays between first
+    and last are worked out on every call."""
+    holiday_base = isinstance(holidays, dict) and hasattr(holidays, 'expand')
+    if not holiday_base and \
+            not isinstance(holidays, (tuple, frozenset, FrozenHolidays)):
+        ret = set()
+        for hol in holidays:
+            o = _toordinal(hol)
+            if first <= o <= last and weekmask[(o - 1) % 7]:
+                ret.add(o)
+        return sorted(ret)
+    lo, hi = date.fromordinal(first).year, date.fromordinal(last).year
+    expand = holiday_base and holidays.expand
+    entry = _sorted_holidays_cache.get(id(holidays))
+    if entry is None or entry[0] is not holidays or \
+            entry[1] != len(holidays) or \
+            expand and not entry[2] <= lo <= hi <= entry[3]:
+        if entry is not None and entry[0] is holidays:
+            lo, hi = min(lo, entry[2]), max(hi, entry[3])
+        if expand:
+            # holidays.HolidayBase only generates the years it has been
+            # asked about so make sure every year in the range is populated
+            for year in range(lo, hi + 1):
+                date(year, 1, 1) in holidays
+        if isinstance(holidays, FrozenHolidays):
+            ordinals = holidays._ordinals
+        else:
+            ordinals = tuple(sorted(set(_toordinal(hol)
+                                        for hol in holidays)))
+        if len(_sorted_holidays_cache) >= _SORTED_HOLIDAYS_CACHE_SIZE:
+            _sorted_holidays_cache.clear()
+        entry = (holidays, len(holidays), lo, hi, {None: ordinals})
+        _sorted_holidays_cache[id(holidays)] = entry
+    by_weekmask = entry[4]
+    weekmask = tuple(weekmask)
+    if weekmask not in by_weekmask:
+        by_weekmask[weekmask] = tuple(o for o in by_weekmask[None]
+                                      if weekmask[(o - 1) % 7])
+    return by_weekmask[weekmask]
+
+
+def _holiday_ordinals(holidays, first, last, weekmask=WEEKMASK):
+    """Return the sorted ordinals of the holidays falling on a day of the
+    weekmask between the ordinals first and last (inclusive)."""
+    if isinstance(holidays, BusinessCalendar):
+        holidays._check(first, last)
+        return holidays._holidays[bisect_left(holidays._holidays, first):
+                                  bisect_right(holidays._holidays, last)]
+    hols = _sorted_holidays(holidays, first, last, weekmask)
+    return list(hols[bisect_left(hols, first):bisect_right(hols, last)])
+
+
+def _count_holidays(holidays, first, last, weekmask=WEEKMASK):
+    """Return the number of holidays falling on a day of the weekmask
+    between the ordinals first and last (inclusive)."""
+    if isinstance(holidays, BusinessCalendar):
+        return len(_holiday_ordinals(holidays, first, last, weekmask))
+    hols = _sorted_holidays(holidays, first, last, weekmask)
+    return bisect_right(hols, last) - bisect_left(hols, first)
+
+
+def _weekdays_before(o, weekmask=WEEKMASK):
+    """Return the number of days of the weekmask with an ordinal lower
+    than o."""
+    # Ordinal 1 is a Monday so the days before o are made up of whole weeks
+    # followed by a partial week
+    weeks, days = divmod(o - 1, 7)
+    return weeks * sum(weekmask) + sum(weekmask[:days])
+
+
+def _weekday_from_count(c, weekmask=WEEKMASK):
+    """Return the ordinal of the day of the weekmask preceded by exactly c
+    days of the weekmask."""
+    days = [i for i, day in enumerate(weekmask) if day]
+    weeks, i = divmod(c, len(days))
+    return weeks * 7 + days[i] + 1
+
+
+def _isbday(o, holidays, weekmask=WEEKMASK):
+    """Return True if the ordinal o falls on a business day."""
+    if isinstance(holidays, BusinessCalendar):
+        return holidays._isbday(o)
+    if isinstance(holidays, FrozenHolidays):
+        return weekmask[(o - 1) % 7] and o not in holidays._set
+    return weekmask[(o - 1) % 7] and date.fromordinal(o) not in holidays
+
+
+def _count_bdays(first, last, holidays, weekmask=WEEKMASK):
+    """Return the number of business days between the ordinals first and
+    last (inclusive)."""
+    if first > last:
+        return 0
+    if isinstance(holidays, BusinessCalendar):
+        return holidays._count_bdays(first, last)
+    return _weekdays_before(last + 1, weekmask) - \
+        _weekdays_before(first, weekmask) - \
+        _count_holidays(holidays, first, last, weekmask)
+
+
+def _offset_bdays(o, n, holidays, weekmask=WEEKMASK):
+    """Return the ordinal of the n-th business day after the ordinal o, or
+    before it if n is negative."""
+    if isinstance(holidays, BusinessCalendar):
+        return holidays._offset_bdays(o, n)
+    while n:
+        # Jump straight to the n-th day of the weekmask then move further
+        # along by one business day for each holiday that was jumped over,
+        # counted by bisecting the sorted holidays
+        if n > 0:
+            t = _weekday_from_count(_weekdays_before(o + 1, weekmask) + n - 1,
+                                    weekmask)
+            n = _count_holidays(holidays, o + 1, t, weekmask)
+        else:
+            t = _weekday_from_count(_weekdays_before(o, weekmask) + n,
+                                    weekmask)
+            n = -_count_holidays(holidays, t, o - 1, weekmask)
+        o = t
+    return o
+
+
+def _nth_bday(year, month, n, holidays, weekmask=WEEKMASK):
+    """Return the ordinal of the n-th business day of the month, counting
+    from the end of the month if n is negative, or None if the month has
+    fewer business days."""
+    if not n:
+        raise ValueError("n must not be 0")
+    if isinstance(holidays, BusinessCalendar):
+        return holidays._nth_bday(year, month, n)
+    first = date(year, month, 1).toordinal()
+    last = first + calendar.monthrange(year, month)[1] - 1
+    if n > 0:
+        o = _offset_bdays(first - 1, n, holidays, weekmask)
+    else:
+        o = _offset_bdays(last + 1, n, holidays, weekmask)
+    return o if first <= o <= last else None
+
+
+def _convention(convention):
+    """Return convention if it is one of CONVENTIONS."""
+    if convention not in CONVENTIONS:
+        raise ValueError("Invalid roll convention '%s'" % convention)
+    return convention
+
+
+def _roll(o, convention, holidays, weekmask=WEEKMASK):
+    """Return the ordinal o rolled to a business day. following and
+    preceding roll forward and backward, the modified conventions roll the
+    other way when that would cross into another month."""
+    forward = convention.endswith('following')
+    for i in range(2):
+        if forward:
+            ret = _offset_bdays(o - 1, 1, holidays, weekmask)
+        else:
+            ret = _offset_bdays(o + 1, -1, holidays, weekmask)
+        if not convention.startswith('modified') or \
+                date.fromordinal(ret).month == date.fromordinal(o).month:
+            break
+        forward = not forward
+    return ret
+
+
+class FrozenHolidays(object):
+    """An immutable snapshot of a set of holidays stored as a sorted array
+    of date ordinals along with a hash set of the same ordinals.
+
+    Unlike holidays.HolidayBase, testing a date never coerces keys or
+    generates holidays for a new year so it is cheap and safe to share
+    between threads. Use freeze_holidays to create one.
+    """
+
+    def __init__(self, ordinals=()):
+        self._set = frozenset(ordinals)
+        self._ordinals = tuple(sorted(self._set))
+
+    def __contains__(self, dt):
+        return _toordinal(dt) in self._set
+
+    def __iter__(self):
+        return (date.fromordinal(o) for o in self._ordinals)
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenHolidays):
+            return NotImplemented
+        return self._set == other._set
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._set)
+
+    def __repr__(self):
+        return "%s(%d holidays)" % (self.__class__.__name__, len(self))
+
+
+def freeze_holidays(holidays, years=None):
+    """Return a FrozenHolidays snapshot of holidays, which can be a
+    holidays.HolidayBase object or any iterable of dates. Holidays objects
+    only hold the years they have been asked about so pass years, a year or
+    a range of years, to have every year from the first to the last
+    generated and included. Dates outside of the snapshot are never
+    holidays."""
+    if isinstance(holidays, FrozenHolidays) and years is None:
+        return holidays
+    if years is None:
+        return FrozenHolidays(_toordinal(hol) for hol in holidays)
+    if isinstance(years, six.integer_types):
+        years = [years]
+    years = list(years)
+    return FrozenHolidays(_holiday_ordinals(
+        holidays, date(min(years), 1, 1).toordinal(),
+        date(max(years), 12, 31).toordinal(), (True,) * 7))
+
+
+class BusinessCalendar(object):
+    """A set of holidays and a weekmask compiled into a bitmap of the
+    business days in a range of years. Holidays are materialized once when
+    the calendar is created and testing a date is a single bit lookup.
+
+    The calendar also keeps a running count of the business days before
+    each date along with the list of business days itself, so counting
+    the business days between two dates or offsetting a date by a number
+    of business days are single lookups regardless of the distance.
+
+    sessions is a dict of the business hours of particular dates, such as
+    early closes, each a list of (start, end) times replacing the usual
+    business hours of relativedelta and rrule on that date. The business
+    days having them are kept sorted so the ones in a range are found with
+    a bisect.
+
+    A BusinessCalendar can be passed anywhere a holidays argument is
+    accepted.
+    """
+
+    def __init__(self, holidays=(), weekmask=None, years=None,
+                 sessions=None):
+        self.weekmask = _weekmask(weekmask)
+        if years is None:
+            years = range(1950, 2100)
+        elif isinstance(years, six.integer_types):
+            years = [years]
+        years = list(years)
+        self.first = date(min(years), 1, 1)
+        self.last = date(max(years), 12, 31)
+        self._first = self.first.toordinal()
+        self._last = self.last.toordinal()
+        hols = set(_holiday_ordinals(holidays, self._first, self._last,
+                                     self.weekmask))
+        bitmap = bytearray((self._last - self._first) // 8 + 1)
+        for o in range(self._first, self._last + 1):
+            if self.weekmask[(o - 1) % 7] and o not in hols:
+                i = o - self._first
+                bitmap[i >> 3] |= 1 << (i & 7)
+        self._index(bytes(bitmap), sessions or {})
+
+    def _index(self, bitmap, sessions):
+        """Set the bitmap and sessions of the calendar and the tables
+        derived from them."""
+        self._bitmap = bitmap
+        # _before[i] is the number of business days before the i-th day of
+        # the calendar and _bdays[n] is the ordinal of the n-th business day
+        self._before = array('l', [0])
+        self._bdays = array('l')
+        self._holidays = []
+        for o in range(self._first, self._last + 1):
+            i = o - self._first
+            if six.indexbytes(bitmap, i >> 3) >> (i & 7) & 1:
+                self._bdays.append(o)
+            elif self.weekmask[(o - 1) % 7]:
+                self._holidays.append(o)
+            self._before.append(len(self._bdays))
+        # _months[m] is the number of business days before the m-th month of
+        # the calendar, its business days are _bdays[_months[m]:_months[m+1]]
+        self._months = array('l')
+        for year in range(self.first.year, self.last.year + 1):
+            for month in range(1, 13):
+                o = date(year, month, 1).toordinal()
+                self._months.append(self._before[o - self._first])
+        self._months.append(len(self._bdays))
+        # Only the sessions of business days matter, _overrides holds their
+        # sorted ordinals and _sessions their compiled sessions
+        self.sessions = {}
+        self._sessions = {}
+        for day, day_sessions in sessions.items():
+            o = _toordinal(day)
+            if self._first <= o <= self._last and self._isbday(o):
+                self.sessions[date.fromordinal(o)] = list(day_sessions)
+                self._sessions[o] = _compile_sessions(day_sessions)
+        self._overrides = array('l', sorted(self._sessions))
+        for o in self._overrides:
+            if o + 1 in self._sessions and \
+                    _overlaps(self._sessions[o], self._sessions[o + 1]):
+                raise ValueError("Business hours sessions must not overlap "
+                                 "those of the next day")
+        # Weekday sessions found not to overlap those of the dates above,
+        # kept by _Sessions so each is only checked once
+        self._checked_sessions = set()
+
+    def _bits(self, first, last):
+        """Return the bitmap of the days between the ordinals first and last
+        as an integer."""
+        bits = int(binascii.hexlify(self._bitmap[::-1]), 16)
+        return bits >> (first - self._first) & (1 << last - first + 1) - 1
+
+    def _combine(self, other, op, weekmask):
+        """Return a calendar combining the bitmaps of both calendars with
+        op over the years covered by both. The weekmask of the result is
+        weekmask applied to the weekmasks of both calendars, its sessions
+        are those of both calendars."""
+        if not isinstance(other, BusinessCalendar):
+            return NotImplemented
+        first = max(self._first, other._first)
+        last = min(self._last, other._last)
+        if first > last:
+            raise ValueError("Business calendars covering different years "
+                             "can't be combined")
+        ret = BusinessCalendar.__new__(BusinessCalendar)
+        ret.weekmask = tuple(bool(weekmask(a, b)) for a, b in
+                             zip(self.weekmask, other.weekmask))
+        ret.first, ret.last = date.fromordinal(first), date.fromordinal(last)
+        ret._first, ret._last = first, last
+        bits = op(self._bits(first, last), other._bits(first, last))
+        size = (last - first) // 8 + 1
+        bitmap = bytearray(binascii.unhexlify(('%x' % bits).zfill(size * 2)))
+        bitmap.reverse()
+        # Sessions of the same date in both calendars are those of this one
+        sessions = dict(other.sessions)
+        sessions.update(self.sessions)
+        ret._index(bytes(bitmap), sessions)
+        return ret
+
+    def __and__(self, other):
+        """Return a calendar of the days that are business days in both
+        calendars, over the years covered by both."""
+        return self._combine(other, lambda a, b: a & b, lambda a, b: a & b)
+
+    def __or__(self, other):
+        """Return a calendar of the days that are business days in either
+        calendar, over the years covered by both."""
+        return self._combine(other, lambda a, b: a | b, lambda a, b: a | b)
+
+    def __sub__(self, other):
+        """Return a calendar of the days that are business days in this
+        calendar but not in the other, over the years covered by both."""
+        return self._combine(other, lambda a, b: a & ~b, lambda a, b: a)
+
+    def _range_error(self):
+        return ValueError("Date outside of the years %d-%d covered by the "
+                          "business calendar"
+                          % (self.first.year, self.last.year))
+
+    def _check(self, first, last):
+        if first < self._first or last > self._last:
+            raise self._range_error()
+
+    def _isbday(self, o):
+        self._check(o, o)
+        i = o - self._first
+        return bool(six.indexbytes(self._bitmap, i >> 3) >> (i & 7) & 1)
+
+    def _count_bdays(self, first, last):
+        self._check(first, last)
+        return self._before[last + 1 - self._first] - \
+            self._before[first - self._first]
+
+    def _offset_bdays(self, o, n):
+        if not n:
+            return o
+        # Callers roll from the day before or after a date so o can be just
+        # outside the calendar, only the days it moves over must be in it
+        if n > 0:
+            self._check(o + 1, o + 1)
+            i = self._before[o + 1 - self._first] + n - 1
+        else:
+            self._check(o - 1, o - 1)
+            i = self._before[o - self._first] + n
+        if not 0 <= i < len(self._bdays):
+            raise self._range_error()
+        return self._bdays[i]
+
+    def _nth_bday(self, year, month, n):
+        m = (year - self.first.year) * 12 + month - 1
+        if not 0 <= m < len(self._months) - 1:
+            raise self._range_error()
+        lo, hi = self._months[m], self._months[m + 1]
+        i = lo + n - 1 if n > 0 else hi + n
+        return self._bdays[i] if lo <= i < hi else None
+
+    def isbday(self, dt):
+        """Return True if dt falls on a business day."""
+        return self._isbday(parse(dt).toordinal())
+
+    def __contains__(self, dt):
+        # A holiday is a day of the weekmask that is not a business day
+        o = parse(dt).toordinal()
+        return self.weekmask[(o - 1) % 7] and not self._isbday(o)
+
+    def __repr__(self):
+        return "%s(weekmask='%s', years=range(%d, %d))" % (
+            self.__class__.__name__,
+            ''.join('1' if day else '0' for day in self.weekmask),
+            self.first.year, self.last.year + 1)
@@ -9,24 +9,173 @@
 #  License: MIT (see LICENSE file)
 
 
+from collections import namedtuple
 from datetime import date, datetime, time
+import itertools
+import re
+import threading
+import weakref
 
 from dateutil.parser import *
 from dateutil.parser import parser
+from dateutil.tz import tzoffset
 import six
 
 
-def parse(timestr, parserinfo=None, **kwargs):
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize',
+                                     'currsize'])
+
+
+class _ParseCache(object):
+    """A thread-safe least recently used cache of parsed strings. Set
+    maxsize to change the number of results kept, 0 turns caching off."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Each key maps to a [prev, next, key, value] link of a circular
+        # list in order of use, the root link sitting between the most and
+        # the least recently used ones
+        self._data = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None]
+        self._lock = threading.Lock()
+
+    def _append(self, link):
+        # Insert link at the most recently used end
+        last = self._root[0]
+        link[0], link[1] = last, self._root
+        last[1] = self._root[0] = link
+
+    def _remove(self, link):
+        link[0][1], link[1][0] = link[1], link[0]
+
+    def get(self, key):
+        with self._lock:
+            link = self._data.get(key)
+            if link is None:
+                self.misses += 1
+                raise KeyError(key)
+            self._remove(link)
+            self._append(link)
+            self.hits += 1
+            return link[3]
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._remove(self._data.pop(key))
+            link = [None, None, key, value]
+            self._append(link)
+            self._data[key] = link
+            while len(self._data) > max(self.maxsize, 0):
+                oldest = self._root[1]
+                self._remove(oldest)
+                del self._data[oldest[2]]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._root[:] = [self._root, self._root, None, None]
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._data))
+
+
+# dateutil parsers hold no state between calls so one is kept per
+# parserinfo instead of building a new one for every string
+_parser = parser()
+_parsers = weakref.WeakKeyDictionary()
+
+
+def _get_parser(parserinfo):
+    if not parserinfo:
+        return _parser
+    try:
+        return _parsers[parserinfo]
+    except KeyError:
+        ret = _parsers[parserinfo] = parser(parserinfo)
+        return ret
+
+
+# YYYY-MM-DD optionally followed by a time of day and a UTC offset as in
+# YYYY-MM-DDTHH:MM:SS.ffffff+HH:MM, and YYYYMMDD
+_ISO = re.compile(r'(\d{4})-(\d\d)-(\d\d)'
+                  r'(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d{1,6}))?)?'
+                  r'(?:([+-])(\d\d)(?::?(\d\d))?)?)?\Z')
+_ISO_BASIC = re.compile(r'(\d{4})(\d\d)(\d\d)\Z')
+
+
+def _parse_iso(timestr):
+    """Return the datetime for a string in one of the fixed formats matched
+    by _ISO or _ISO_BASIC or None if it is anything else, including an
+    invalid date."""
+    m = _ISO.match(timestr) or _ISO_BASIC.match(timestr)
+    if not m:
+        return None
+    year, month, day, hour, minute, second, fraction, sign, tzhours, \
+        tzminutes = m.groups() + (None,) * (10 - len(m.groups()))
+    # dateutil returns tzutc or tzlocal for zero offsets depending on the
+    # local timezone so leave those to it
+    offset = 0
+    if sign:
+        offset = int(tzhours) * 3600 + int(tzminutes or 0) * 60
+        if not offset:
+            return None
+    try:
+        ret = datetime(int(year), int(month), int(day), int(hour or 0),
+                       int(minute or 0), int(second or 0),
+                       int((fraction or '0').ljust(6, '0')))
+    except ValueError:
+        return None
+    if offset:
+        ret = ret.replace(tzinfo=tzoffset(None, offset if sign == '+'
+                                          else -offset))
+    return ret
+
+
+def _parse(timestr, parserinfo, kwargs, today=None):
+    if not parserinfo and not kwargs and timestr[:1].isdigit():
+        ret = _parse_iso(timestr)
+        if ret is not None:
+            return ret
+    if today is not None:
+        # Fill in what the string leaves out from the same day the result
+        # is cached under
+        kwargs = dict(kwargs, default=datetime.combine(today, time()))
+    try:
+        return _get_parser(parserinfo).parse(timestr, **kwargs)
+    except TypeError:
+        raise ValueError("Can't parse date from string '%s'" % timestr)
+
+
+def parse(timestr, parserinfo=None, cache=True, **kwargs):
     if isinstance(timestr, six.binary_type):
         timestr = timestr.decode()
     if isinstance(timestr, six.string_types):
-        try:
-            if parserinfo:
-                ret = parser(parserinfo).parse(timestr, **kwargs)
-            else:
-                ret = parser().parse(timestr, **kwargs)
-        except TypeError:
-            raise ValueError("Can't parse date from string '%s'" % timestr)
+        key = today = None
+        if cache and parse.cache.maxsize > 0:
+            # Without a default dateutil takes whatever the string leaves
+            # out, such as the date of "10:30", from today so results are
+            # only reused on the day they were parsed
+            if 'default' not in kwargs:
+                today = date.today()
+            key = (timestr, parserinfo, tuple(sorted(kwargs.items())), today)
+            try:
+                return parse.cache.get(key)
+            except KeyError:
+                pass
+            except TypeError:
+                # Unhashable keyword arguments such as a tzinfos dict
+                key = None
+        ret = _parse(timestr, parserinfo, kwargs, today)
+        if key is not None:
+            parse.cache.set(key, ret)
     elif isinstance(timestr, int) or isinstance(timestr, float):
         ret = datetime.fromtimestamp(timestr)
     elif isinstance(timestr, datetime) or isinstance(timestr, date):
@@ -36,3 +185,113 @@ def parse(timestr, parserinfo=None, **kwargs):
     else:
         raise TypeError("Can't convert %s to date." % type(timestr))
     return ret
+
+
+# Strings are parsed once and the result reused, use parse.cache.info() for
+# the hit and miss counts, parse.cache.maxsize to resize the cache and
+# cache=False to parse a string again
+parse.cache = _ParseCache()
+
+
+# Formats parse_many tries on a sample of each batch, all of them give the
+# same result as parse for any string they match
+FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S',
+           '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S',
+           '%Y-%m-%dT%H:%M:%S.%f', '%Y%m%d', '%Y/%m/%d', '%Y/%m/%d %H:%M',
+           '%Y/%m/%d %H:%M:%S', '%Y.%m.%d', '%m/%d/%Y', '%m/%d/%Y %H:%M',
+           '%m/%d/%Y %H:%M:%S', '%m-%d-%Y', '%m.%d.%Y')
+
+_FIELDS = {'Y': ('year', 4, 4), 'm': ('month', 1, 2), 'd': ('day', 1, 2),
+           'H': ('hour', 1, 2), 'M': ('minute', 2, 2),
+           'S': ('second', 2, 2), 'f': ('microsecond', 1, 6)}
+
+
+def _compile(fmt):
+    """Return a function turning a string in the strftime style format fmt
+    into a datetime, or None if the string does not match or is not a valid
+    date. Only the directives in _FIELDS are supported."""
+    parts = fmt.split('%')
+    pattern = re.escape(parts[0])
+    fields = []
+    for i, part in enumerate(parts[1:], 1):
+        name, lo, hi = _FIELDS[part[0]]
+        if len(part) == 1 and i + 1 < len(parts) or \
+                i > 1 and len(parts[i - 1]) == 1:
+            # Directives next to one another are fixed width
+            lo = hi
+        pattern += r'(\d{%d,%d})' % (lo, hi) + re.escape(part[1:])
+        fields.append(name)
+    match = re.compile(pattern + r'\Z').match
+
+    def convert(timestr):
+        m = match(timestr)
+        if not m:
+            return None
+        values = dict(zip(fields, m.groups()))
+        if 'microsecond' in values:
+            values['microsecond'] = values['microsecond'].ljust(6, '0')
+        try:
+            return datetime(**dict((k, int(v)) for k, v in values.items()))
+        except ValueError:
+            return None
+    return convert
+
+
+def _infer(sample):
+    """Return the converter for the format in FORMATS matching the most
+    strings of sample or None if none of them match any."""
+    best, hits = None, 0
+    for fmt in FORMATS:
+        convert = _compile(fmt)
+        n = 0
+        for timestr in sample:
+            ret = convert(timestr)
+            if ret is not None and ret == parse(timestr):
+                n += 1
+        if n > hits:
+            best, hits = convert, n
+        if hits == len(sample):
+            break
+    return best
+
+
+def parse_many(timestrs, parserinfo=None, sample=20, datetime64=False,
+               **kwargs):
+    """Parse every value of the iterable timestrs. The format of the batch
+    is inferred from its first sample strings and applied to each of them,
+    only those not matching it go through parse. Values are consumed as
+    they are needed so timestrs can be a generator.
+
+    Returns a generator of the results or, with datetime64=True, a NumPy
+    array of datetime64[us] with timezones dropped."""
+    ret = _parse_many(iter(timestrs), parserinfo, sample, kwargs)
+    if datetime64:
+        from bdateutil.vectorized import _numpy
+        np = _numpy()
+        ret = [dt.replace(tzinfo=None) if isinstance(dt, datetime) else
+               datetime(dt.year, dt.month, dt.day) for dt in ret]
+        return np.array(ret, dtype='datetime64[us]')
+    return ret
+
+
+def _parse_many(timestrs, parserinfo, sample, kwargs):
+    head = list(itertools.islice(timestrs, sample))
+    convert = None
+    if not parserinfo and not kwargs:
+        # Keyword arguments like dayfirst change the meaning of formats so
+        # batches using them are parsed one string at a time
+        convert = _infer([timestr.decode()
+                          if isinstance(timestr, six.binary_type)
+                          else timestr for timestr in head
+                          if isinstance(timestr, six.string_types) or
+                          isinstance(timestr, six.binary_type)])
+    for timestr in itertools.chain(head, timestrs):
+        if convert is not None:
+            if isinstance(timestr, six.binary_type):
+                timestr = timestr.decode()
+            if isinstance(timestr, six.string_types):
+                ret = convert(timestr)
+                if ret is not None:
+                    yield ret
+                    continue
+        yield parse(timestr, parserinfo, **kwargs)
@@ -9,31 +9,303 @@
 #  License: MIT (see LICENSE file)
 
 
-from collections import defaultdict
-from datetime import date, datetime, time
+import bisect
+from datetime import date, datetime, time, timedelta
 import math
 
 from dateutil.relativedelta import relativedelta as rd
 from dateutil.relativedelta import MO, TU, WE, TH, FR, SA, SU
 import six
 
+from bdateutil.bcalendar import BusinessCalendar
+from bdateutil.bcalendar import _count_bdays, _isbday, _offset_bdays
+from bdateutil.bcalendar import _holiday_ordinals
+from bdateutil.bcalendar import _DAY, _compile_sessions, _microseconds, \
+    _overlaps
+from bdateutil.bcalendar import _weekmask
 from bdateutil.parser import parse
 
 
+_BATTRS = ('bdays', 'bhours', 'bminutes', 'bseconds')
+
+# Number of weekday sessions a BusinessCalendar remembers having checked
+# against the sessions of its dates
+_CHECKED_SESSIONS_SIZE = 64
+
+
+class _Sessions(object):
+    """Business hours as sorted (start, end) sessions for each weekday,
+    Monday first, in microseconds since midnight of the day they belong to
+    along with the business time elapsed at the start of each session, so
+    the business time up to any time of day is a bisect.
+
+    sessions is a list of (start, end) times shared by every weekday or a
+    dict of such lists keyed by weekday, the weekdays missing from it having
+    no business hours. Without sessions business hours run from btstart to
+    btend. A session ending at or before its start time wraps midnight and
+    ends on the next day, it still belongs to the day it started on.
+
+    The sessions of particular dates held by a BusinessCalendar passed as
+    holidays replace those of their weekday."""
+
+    def __init__(self, sessions, btstart, btend, holidays=()):
+        if sessions is None:
+            sessions = [(btstart, btend)]
+        if isinstance(sessions, dict):
+            sessions = dict((getattr(k, 'weekday', k), v)
+                            for k, v in sessions.items())
+            days = [sessions.get(i, ()) for i in range(7)]
+        else:
+            days = [sessions] * 7
+        self.days = [_compile_sessions(day) for day in days]
+        self.lengths = [totals[-1] for starts, ends, totals in self.days]
+        if isinstance(holidays, BusinessCalendar):
+            self.overrides = holidays._sessions
+            self.dates = holidays._overrides
+        else:
+            self.overrides = {}
+            self.dates = ()
+        pairs = [(self.days[wd], self.days[(wd + 1) % 7]) for wd in range(7)]
+        # The sessions of a date with sessions of its own must not run into
+        # those of the next day or the previous day's into them either. That
+        # only needs checking once for each calendar and weekday sessions.
+        key = None
+        if self.dates:
+            key = tuple((tuple(starts), tuple(ends))
+                        for starts, ends, totals in self.days)
+            if key in holidays._checked_sessions:
+                key = None
+        if key is not None:
+            for o in self.dates:
+                pairs.append((self.day(o - 1), self.day(o)))
+                pairs.append((self.day(o), self.day(o + 1)))
+        if any(_overlaps(day, next_day) for day, next_day in pairs):
+            raise ValueError("Business hours sessions must not overlap "
+                             "those of the next day")
+        if key is not None:
+            if len(holidays._checked_sessions) >= _CHECKED_SESSIONS_SIZE:
+                holidays._checked_sessions.clear()
+            holidays._checked_sessions.add(key)
+
+    def day(self, o):
+        """Return the starts, ends and running totals of the sessions of the
+        ordinal o."""
+        return self.overrides.get(o) or self.days[(o - 1) % 7]
+
+    def total(self, o):
+        """Return the business time of the ordinal o."""
+        return self.day(o)[2][-1]
+
+    def before(self, o, t):
+        """Return the business time of the ordinal o before t microseconds
+        after its midnight, which can be past the next midnight."""
+        starts, ends, totals = self.day(o)
+        i = bisect.bisect_right(starts, t)
+        if not i:
+            return 0
+        return totals[i - 1] + min(t, ends[i - 1]) - starts[i - 1]
+
+    def at(self, o, b):
+        """Return the microseconds after midnight of the ordinal o by which b
+        of its business time has elapsed, the end of a session being the
+        start of the next one."""
+        starts, ends, totals = self.day(o)
+        i = bisect.bisect_right(totals, b) - 1
+        return starts[i] + b - totals[i]
+
+    def length(self, weekmask):
+        """Return the business time of every business day of weekmask, dates
+        with sessions of their own aside, or None if it depends on the
+        weekday."""
+        lengths = set(l for l, m in zip(self.lengths, weekmask) if m)
+        if not any(lengths):
+            raise ValueError("There are no business hours on business days")
+        return lengths.pop() if len(lengths) == 1 else None
+
+
+def _week_btime(weekmask, sessions):
+    """Return the business time of the days of the weekmask in a week before
+    each weekday, Monday first, followed by that of the whole week."""
+    ret = [0]
+    for wd in range(7):
+        ret.append(ret[-1] + (sessions.lengths[wd] if weekmask[wd] else 0))
+    return ret
+
+
+def _week_btime_before(o, week):
+    """Return the business time of the days before the ordinal o given the
+    business time of a week from _week_btime, holidays aside."""
+    weeks, days = divmod(o - 1, 7)
+    return weeks * week[7] + week[days]
+
+
+def _week_btime_at(t, week):
+    """Return the ordinal of the day during which t of business time counted
+    by _week_btime_before has elapsed along with its business time elapsed
+    by then."""
+    weeks, t = divmod(t, week[7])
+    days = bisect.bisect_right(week, t) - 1
+    return weeks * 7 + days + 1, t - week[days]
+
+
+def _forward_bdays(o, r, holidays, weekmask, sessions):
+    """Return the ordinal of the business day and its business time reached
+    r of business time after the start of the business day o, with no dates
+    having sessions of their own on the way."""
+    length = sessions.length(weekmask)
+    if length is not None:
+        days, r = divmod(r, length)
+        return _offset_bdays(o, days, holidays, weekmask), r
+    # Jump straight to the day reached in a week without holidays then move
+    # further along by the business time of each holiday jumped over
+    week = _week_btime(weekmask, sessions)
+    t = _week_btime_before(o, week) + r
+    while True:
+        p, b = _week_btime_at(t, week)
+        hols = _holiday_ordinals(holidays, o, p, weekmask)
+        if not hols:
+            return p, b
+        t += sum(sessions.lengths[(h - 1) % 7] for h in hols)
+        o = p + 1
+
+
+def _backward_bdays(o, r, holidays, weekmask, sessions):
+    """Return the ordinal of the business day and its business time reached
+    r of business time before the end of the business day o, with no dates
+    having sessions of their own on the way."""
+    length = sessions.length(weekmask)
+    if length is not None:
+        days, b = divmod(-r, length)
+        return _offset_bdays(o, days + 1, holidays, weekmask), b
+    week = _week_btime(weekmask, sessions)
+    t = _week_btime_before(o + 1, week) - r
+    while True:
+        p, b = _week_btime_at(t, week)
+        hols = _holiday_ordinals(holidays, p, o, weekmask)
+        if not hols:
+            return p, b
+        t -= sum(sessions.lengths[(h - 1) % 7] for h in hols)
+        o = p - 1
+
+
+def _forward_btime(o, r, holidays, weekmask, sessions):
+    """Return the ordinal of the business day and its business time reached
+    r of business time after the start of the business day o."""
+    while True:
+        # Every business day up to the next one with sessions of its own
+        # follows the sessions of its weekday
+        i = bisect.bisect_left(sessions.dates, o)
+        if i == len(sessions.dates):
+            return _forward_bdays(o, r, holidays, weekmask, sessions)
+        p = sessions.dates[i]
+        n = _btime_between(o, p, holidays, weekmask, sessions)
+        if r < n:
+            return _forward_bdays(o, r, holidays, weekmask, sessions)
+        r -= n
+        if r < sessions.total(p):
+            return p, r
+        r -= sessions.total(p)
+        o = _offset_bdays(p, 1, holidays, weekmask)
+
+
+def _backward_btime(o, r, holidays, weekmask, sessions):
+    """Return the ordinal of the business day and its business time reached
+    r of business time before the end of the business day o."""
+    while True:
+        i = bisect.bisect_right(sessions.dates, o)
+        if not i:
+            return _backward_bdays(o, r, holidays, weekmask, sessions)
+        p = sessions.dates[i - 1]
+        n = _btime_between(p + 1, o + 1, holidays, weekmask, sessions)
+        if r <= n:
+            return _backward_bdays(o, r, holidays, weekmask, sessions)
+        r -= n
+        if r <= sessions.total(p):
+            return p, sessions.total(p) - r
+        r -= sessions.total(p)
+        o = _offset_bdays(p, -1, holidays, weekmask)
+
+
+def _bposition(dt, holidays, weekmask, sessions):
+    """Return the ordinal of the business day dt is in and its business time
+    elapsed by dt, a dt outside of business hours being at the next opening
+    time."""
+    t = _microseconds(dt.time())
+    # dt can be in a session of the day before that wraps midnight
+    for o, tod in ((dt.toordinal() - 1, t + _DAY), (dt.toordinal(), t)):
+        b = sessions.before(o, tod)
+        if b < sessions.total(o) and _isbday(o, holidays, weekmask):
+            return o, b
+    return _offset_bdays(o, 1, holidays, weekmask), 0
+
+
+def _btime_between(first, last, holidays, weekmask, sessions):
+    """Return the business time of the business days from the ordinal first
+    up to but excluding the ordinal last."""
+    length = sessions.length(weekmask)
+    if length is not None:
+        ret = _count_bdays(first, last - 1, holidays, weekmask) * length
+    else:
+        week = _week_btime(weekmask, sessions)
+        ret = _week_btime_before(last, week) - \
+            _week_btime_before(first, week)
+        for o in _holiday_ordinals(holidays, first, last - 1, weekmask):
+            ret -= sessions.lengths[(o - 1) % 7]
+    for o in sessions.dates[bisect.bisect_left(sessions.dates, first):
+                            bisect.bisect_left(sessions.dates, last)]:
+        ret += sessions.total(o) - sessions.lengths[(o - 1) % 7]
+    return ret
+
+
+def _btime(start, end, holidays, weekmask, sessions):
+    """Return the business time in microseconds from the datetime start to
+    the datetime end, negative if end is before start."""
+    if end < start:
+        return -_btime(end, start, holidays, weekmask, sessions)
+    o1, b1 = _bposition(start, holidays, weekmask, sessions)
+    o2, b2 = _bposition(end, holidays, weekmask, sessions)
+    return _btime_between(o1, o2, holidays, weekmask, sessions) - b1 + b2
+
+
+def _add_btime(dt, us, holidays, weekmask, sessions):
+    """Return the datetime us microseconds of business time after dt, or
+    before it if us is negative. A dt outside of business hours is first
+    rolled forward to the next opening time."""
+    o, b = _bposition(dt, holidays, weekmask, sessions)
+    b += us
+    if b >= sessions.total(o):
+        o, b = _forward_btime(_offset_bdays(o, 1, holidays, weekmask),
+                              b - sessions.total(o), holidays, weekmask,
+                              sessions)
+    elif b < 0:
+        o, b = _backward_btime(_offset_bdays(o, -1, holidays, weekmask),
+                               -b, holidays, weekmask, sessions)
+    return dt + timedelta(days=o - dt.toordinal(),
+                          microseconds=sessions.at(o, b) -
+                          _microseconds(dt.time()))
+
+
 class relativedelta(rd):
 
     def __init__(self, dt1=None, dt2=None, bdays=None, holidays=None,
                  bhours=None, bminutes=None, bseconds=None,
-                 btstart=None, btend=None, *args, **kwargs):
+                 btstart=None, btend=None, weekmask=None, sessions=None,
+                 *args, **kwargs):
         self.holidays = holidays
         if self.holidays is None:
             self.holidays = getattr(relativedelta, 'holidays', ())
+        if weekmask is None:
+            weekmask = getattr(relativedelta, 'weekmask', None)
+        self.weekmask = _weekmask(weekmask, self.holidays)
         self.btstart = btstart
         if self.btstart is None:
             self.btstart = getattr(relativedelta, 'btstart', time(9))
         self.btend = btend
         if self.btend is None:
             self.btend = getattr(relativedelta, 'btend', time(17))
+        self.sessions = sessions
+        if self.sessions is None:
+            self.sessions = getattr(relativedelta, 'sessions', None)
         if dt1 and dt2:
             # Convert to datetime objects
             dt1 = parse(dt1)
@@ -49,24 +321,29 @@ class relativedelta(rd):
             # Call super init before setting self.bdays to avoid base __radd__
             # from calling child __add__ and creating infinite loop
             rd.__init__(self, dt1, dt2, *args, **kwargs)
-            c = defaultdict(int)
             d1 = max(dt1, dt2)
             d2 = min(dt1, dt2)
-            if d1.weekday() in (5, 6) or d1 in self.holidays:
-                c['bdays'] += 1
-            for attr in ('bhours', 'bminutes', 'bseconds'):
-                while getattr(d1, attr[1:-1]) != getattr(d2, attr[1:-1]):
-                    d2 += rd(**{attr[1:]: +1})
-                    if d2.time() >= self.btstart and d2.time() < self.btend:
-                        c[attr] += 1
-            while d1 > d2:
-                d2 += rd(days=+1)
-                if d2.weekday() not in (5, 6) and d2 not in self.holidays:
-                    c['bdays'] += 1
-            self.bdays = c['bdays']
-            self.bhours = c['bhours']
-            self.bminutes = c['bminutes']
-            self.bseconds = c['bseconds']
+            self.bdays = 0 if _isbday(d1.toordinal(), self.holidays,
+                                      self.weekmask) else 1
+            # Business time is measured while d2 is brought forward to the
+            # time of day of d1, what remains is a whole number of days.
+            # Sessions of the day before d2 can wrap into it and those of the
+            # day after can be reached.
+            sessions = _Sessions(self.sessions, self.btstart, self.btend,
+                                 self.holidays)
+            o = d2.toordinal()
+            t2 = _microseconds(d2.time())
+            t1 = t2 + (_microseconds(d1.time()) - t2) % _DAY
+
+            def btime(t):
+                return sum(sessions.before(o + day, t - day * _DAY)
+                           for day in (-1, 0, 1))
+            secs = (btime(t1) - btime(t2)) // 1000000
+            self.bhours, secs = divmod(secs, 3600)
+            self.bminutes, self.bseconds = divmod(secs, 60)
+            d2 += timedelta(microseconds=t1 - t2)
+            self.bdays += _count_bdays(d2.toordinal() + 1, d1.toordinal(),
+                                       self.holidays, self.weekmask)
             if dt2 > dt1:
                 self.bdays *= -1
                 self.bhours *= -1
@@ -77,13 +354,14 @@ class relativedelta(rd):
             self.bhours = bhours
             self.bminutes = bminutes
             self.bseconds = bseconds
-            bd = rd(datetime.combine(datetime.now(), self.btend),
-                    datetime.combine(datetime.now(), self.btstart))
             if isinstance(self.bdays, float):
+                length = _Sessions(self.sessions, self.btstart,
+                                   self.btend).length(self.weekmask)
+                if length is None:
+                    raise ValueError("Fractional bdays need business days "
+                                     "of the same length")
                 self.bhours = self.bhours or 0
-                self.bhours += (self.bdays % 1) * \
-                               (bd.hours + bd.minutes / 60 +
-                                bd.seconds / 60 / 60)
+                self.bhours += (self.bdays % 1) * length / 3600000000.0
                 self.bdays = int(math.floor(self.bdays))
                 if self.bdays == 0:
                     self.bdays = None
@@ -114,32 +392,28 @@ class relativedelta(rd):
                         setattr(ret, attr, getattr(self, attr))
                 elif getattr(other, attr, None) is not None:
                     setattr(ret, attr, getattr(other, attr))
+            self._copy_settings(other, ret)
             return ret
         ret = parse(other)
-        # If we are adding any time (not just dates) the ret object to return
-        # must be a datetime object; a date object will not work
-        if not isinstance(ret, datetime) \
-                and (self.bhours or self.bminutes or self.bseconds):
-            ret = datetime.combine(ret, datetime.min.time())
-        for attr in ('bseconds', 'bminutes', 'bhours', 'bdays'):
-            if getattr(self, attr, None) is not None:
-                while ret.weekday() in (5, 6) or ret in self.holidays:
-                    ret += rd(days=+1)
-                while attr != "bdays" and \
-                        (ret.time() < self.btstart or
-                         ret.time() >= self.btend):
-                    ret += rd(**{attr[1:]: +1})
-                i = getattr(self, attr)
-                a = +1 if i > 0 else -1
-                while i != 0:
-                    ret += rd(**{attr[1:]: a})
-                    while ret.weekday() in (5, 6) or ret in self.holidays:
-                        ret += rd(days=a)
-                    while attr != "bdays" and \
-                            (ret.time() < self.btstart or
-                             ret.time() >= self.btend):
-                        ret += rd(**{attr[1:]: a})
-                    i -= a
+        btime = [getattr(self, attr, None)
+                 for attr in ('bhours', 'bminutes', 'bseconds')]
+        if btime != [None, None, None]:
+            # If we are adding any time (not just dates) the ret object to
+            # return must be a datetime object; a date object will not work
+            if not isinstance(ret, datetime):
+                ret = datetime.combine(ret, datetime.min.time())
+            bhours, bminutes, bseconds = [i or 0 for i in btime]
+            us = ((bhours * 60 + bminutes) * 60 + bseconds) * 1000000
+            sessions = _Sessions(self.sessions, self.btstart, self.btend,
+                                 self.holidays)
+            ret = _add_btime(ret, int(round(us)), self.holidays,
+                             self.weekmask, sessions)
+        if getattr(self, 'bdays', None) is not None:
+            # Roll forward to a business day then offset from there
+            o = ret.toordinal()
+            t = _offset_bdays(o - 1, 1, self.holidays, self.weekmask)
+            t = _offset_bdays(t, self.bdays, self.holidays, self.weekmask)
+            ret += timedelta(days=t - o)
         return rd.__add__(self, ret)
 
     def __radd__(self, other):
@@ -154,22 +428,42 @@ class relativedelta(rd):
                 if getattr(other, attr, None) is not None:
                     setattr(ret, attr,
                             getattr(ret, attr) - getattr(other, attr))
+        self._copy_settings(other, ret)
         return ret
 
+    def _copy_settings(self, other, ret):
+        """Give ret, the result of combining self with the relativedelta
+        other, the holidays, weekmask and business hours of self, or those
+        of other when only other has business days or time."""
+        src = self
+        if not any(getattr(self, attr, None) for attr in _BATTRS) and \
+                any(getattr(other, attr, None) for attr in _BATTRS):
+            src = other
+        for attr in ('holidays', 'weekmask', 'btstart', 'btend', 'sessions'):
+            setattr(ret, attr, getattr(src, attr))
+
     def __rsub__(self, other):
         if getattr(self, 'bdays', None) is not None:
             other = parse(other)
             if self.bdays == 0:
-                while other.weekday() in (5, 6) or other in self.holidays:
-                    other += rd(days=-1)
+                # Roll backward to a business day
+                o = other.toordinal()
+                other += timedelta(days=_offset_bdays(
+                    o + 1, -1, self.holidays, self.weekmask) - o)
         return self.__neg__().__radd__(other)
 
     def __neg__(self):
-        bdays = -self.bdays if self.bdays is not None else None
+        b = dict((attr, -getattr(self, attr))
+                 for attr in ('bdays', 'bhours', 'bminutes', 'bseconds')
+                 if getattr(self, attr) is not None)
         return relativedelta(years=-self.years,
                              months=-self.months,
                              days=-self.days,
-                             bdays=bdays,
+                             holidays=self.holidays,
+                             weekmask=self.weekmask,
+                             btstart=self.btstart,
+                             btend=self.btend,
+                             sessions=self.sessions,
                              hours=-self.hours,
                              minutes=-self.minutes,
                              seconds=-self.seconds,
@@ -182,7 +476,8 @@ class relativedelta(rd):
                              hour=self.hour,
                              minute=self.minute,
                              second=self.second,
-                             microsecond=self.microsecond)
+                             microsecond=self.microsecond,
+                             **b)
 
     def __bool__(self):
         if self.bdays is None:
@@ -194,10 +489,18 @@ class relativedelta(rd):
     def __mul__(self, other):
         f = float(other)
         bdays = int(self.bdays * f) if self.bdays is not None else None
+        b = dict((attr, getattr(self, attr) * f)
+                 for attr in ('bhours', 'bminutes', 'bseconds')
+                 if getattr(self, attr) is not None)
         return relativedelta(years=int(self.years * f),
                              months=int(self.months * f),
                              days=int(self.days * f),
                              bdays=bdays,
+                             holidays=self.holidays,
+                             weekmask=self.weekmask,
+                             btstart=self.btstart,
+                             btend=self.btend,
+                             sessions=self.sessions,
                              hours=int(self.hours * f),
                              minutes=int(self.minutes * f),
                              seconds=int(self.seconds * f),
@@ -210,7 +513,10 @@ class relativedelta(rd):
                              hour=self.hour,
                              minute=self.minute,
                              second=self.second,
-                             microsecond=self.microsecond)
+                             microsecond=self.microsecond,
+                             **b)
+
+    __rmul__ = __mul__
 
     def __eq__(self, other):
         for attr in ('bdays', 'bhours', 'bminutes', 'bseconds'):
@@ -237,3 +543,126 @@ class relativedelta(rd):
             if value is not None:
                 l.append("%s=%s" % (attr, repr(value)))
         return "%s(%s)" % (self.__class__.__name__, ", ".join(l))
+
+
+class BusinessDuration(object):
+    """An amount of business time held as a whole number of business
+    seconds, so arithmetic, comparison and hashing are integer operations.
+
+    Unlike relativedelta it has no calendar fields and no holidays, it is
+    converted to a relativedelta with to_relativedelta to be added to a
+    date. from_relativedelta converts the business fields of a
+    relativedelta, its bdays being as long as its business days."""
+
+    __slots__ = ('_seconds',)
+
+    def __init__(self, bhours=0, bminutes=0, bseconds=0):
+        self._seconds = int(round((bhours * 60 + bminutes) * 60 + bseconds))
+
+    @classmethod
+    def from_relativedelta(cls, delta):
+        """Return the business time of the bdays, bhours, bminutes and
+        bseconds of the relativedelta delta."""
+        seconds = ((delta.bhours or 0) * 60 + (delta.bminutes or 0)) * 60 + \
+            (delta.bseconds or 0)
+        if delta.bdays:
+            length = _Sessions(delta.sessions, delta.btstart, delta.btend,
+                               delta.holidays).length(delta.weekmask)
+            if length is None:
+                raise ValueError("bdays need business days of the same "
+                                 "length")
+            seconds += delta.bdays * length // 1000000
+        return cls(bseconds=seconds)
+
+    def to_relativedelta(self, **kwargs):
+        """Return a relativedelta of the business time, kwargs being passed
+        on to relativedelta."""
+        bhours, bminutes, bseconds = self._split()
+        return relativedelta(bhours=bhours, bminutes=bminutes,
+                             bseconds=bseconds, **kwargs)
+
+    def _split(self):
+        """Return the business time as hours, minutes and seconds all of
+        the same sign."""
+        sign = -1 if self._seconds < 0 else 1
+        minutes, seconds = divmod(abs(self._seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return sign * hours, sign * minutes, sign * seconds
+
+    @property
+    def seconds(self):
+        return self._seconds
+
+    def __add__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return BusinessDuration(bseconds=self._seconds + other._seconds)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return BusinessDuration(bseconds=self._seconds - other._seconds)
+
+    def __neg__(self):
+        return BusinessDuration(bseconds=-self._seconds)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return BusinessDuration(bseconds=abs(self._seconds))
+
+    def __mul__(self, other):
+        if not isinstance(other, (six.integer_types, float)):
+            return NotImplemented
+        return BusinessDuration(bseconds=self._seconds * other)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds == other._seconds
+
+    def __ne__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds != other._seconds
+
+    def __lt__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds < other._seconds
+
+    def __le__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds <= other._seconds
+
+    def __gt__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds > other._seconds
+
+    def __ge__(self, other):
+        if not isinstance(other, BusinessDuration):
+            return NotImplemented
+        return self._seconds >= other._seconds
+
+    def __hash__(self):
+        return hash(self._seconds)
+
+    def __bool__(self):
+        return bool(self._seconds)
+
+    __nonzero__ = __bool__
+
+    def __reduce__(self):
+        return (BusinessDuration, (0, 0, self._seconds))
+
+    def __repr__(self):
+        l = ["%s=%+d" % (attr, value) for attr, value in
+             zip(("bhours", "bminutes", "bseconds"), self._split()) if value]
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(l))
@@ -9,22 +9,69 @@
 #  License: MIT (see LICENSE file)
 
 
+import copy
+import sys
+from datetime import date, datetime, time, timedelta, MAXYEAR
+
 from dateutil.rrule import *
 from dateutil.rrule import rrule as rrulebase
 from dateutil.rrule import _rrulestr as rrulestrbase
+import six
 
 from bdateutil import parse
+from bdateutil.bcalendar import _count_bdays, _isbday, _offset_bdays
+from bdateutil.bcalendar import _convention, _nth_bday, _roll, _weekmask
+from bdateutil.relativedelta import _add_btime, _Sessions
 
 
 BDAILY = 8
+BHOURLY = 9
+BMINUTELY = 10
+
+# The byxxx rules that select dates rather than times of day
+_BYDATE = ('bymonth', 'byweekno', 'byyearday', 'byweekday', 'bynweekday',
+           'byeaster', 'bymonthday', 'bynmonthday', 'bysetpos')
 
 
 class rrule(rrulebase):
 
-    def __init__(self, freq, holidays=None, **kwargs):
+    _bstep = False
+    _bybday = None
+    _btime = None
+    roll = None
+
+    def __init__(self, freq, holidays=None, weekmask=None, roll=None,
+                 bybday=None, btstart=None, btend=None, sessions=None,
+                 **kwargs):
         self.holidays = holidays
         if self.holidays is None:
             self.holidays = getattr(rrule, 'holidays', ())
+        if weekmask is None:
+            weekmask = getattr(rrule, 'weekmask', None)
+        self.weekmask = _weekmask(weekmask, self.holidays)
+        self.btstart = btstart
+        if self.btstart is None:
+            self.btstart = getattr(rrule, 'btstart', time(9))
+        self.btend = btend
+        if self.btend is None:
+            self.btend = getattr(rrule, 'btend', time(17))
+        self.sessions = sessions
+        if self.sessions is None:
+            self.sessions = getattr(rrule, 'sessions', None)
+        if roll is not None:
+            self.roll = _convention(roll)
+        if bybday is not None:
+            if freq != MONTHLY:
+                raise ValueError("bybday is only supported with MONTHLY")
+            if any(kwargs.get(rule) is not None
+                   for rule in _BYDATE if rule != 'bymonth'):
+                raise ValueError("bybday can't be combined with byxxx "
+                                 "rules other than bymonth")
+            if isinstance(bybday, six.integer_types):
+                bybday = (bybday,)
+            if not all(bybday):
+                raise ValueError("bybday can't contain 0")
+            self._bybday = tuple(bybday)
         if 'dtstart' in kwargs:
             kwargs['dtstart'] = parse(kwargs['dtstart'])
         if 'until' in kwargs:
@@ -32,28 +79,233 @@ class rrule(rrulebase):
         if freq == BDAILY:
             rrulebase.__init__(self, DAILY, **kwargs)
             self._bdaily = True
-            if self._count:
-                self._count *= 2
+        elif freq in (BHOURLY, BMINUTELY):
+            if any(key.startswith('by') for key in kwargs):
+                raise ValueError("byxxx rules are not supported with "
+                                 "BHOURLY and BMINUTELY")
+            rrulebase.__init__(self, HOURLY if freq == BHOURLY else MINUTELY,
+                               **kwargs)
+            self._bdaily = False
+            # Microseconds of business time between occurrences
+            self._btime = self._interval * 1000000 * \
+                (3600 if freq == BHOURLY else 60)
         else:
             rrulebase.__init__(self, freq, **kwargs)
             self._bdaily = False
+        # BDAILY rules without date selecting byxxx rules step from one
+        # business day to the next so any occurrence can be computed directly
+        self._bstep = self._bdaily and \
+            not any(getattr(self, '_' + rule) for rule in _BYDATE)
 
     def _iter(self):
+        if self._bstep:
+            gen = self._iter_bdays()
+        elif self._bdaily:
+            gen = self._iter_filtered()
+        elif self._bybday:
+            gen = self._iter_bybday()
+        elif self._btime:
+            gen = self._iter_btime()
+        elif self.roll:
+            gen = self._iter_rolled()
+        else:
+            for i in rrulebase._iter(self):
+                yield i
+            return
+        # Stop as soon as the count is reached rather than at the next
+        # occurrence, which can be past the end of a BusinessCalendar
         total = 0
-        for i in rrulebase._iter(self):
-            if self._bdaily:
-                if i.weekday() < 5 and i not in self.holidays:
-                    total += 1
-                    if self._count and total > self._count / 2:
-                        self._len = total
-                        return
-                    elif self._until and i > self._until:
-                        self._len = total
-                        return
-                    yield i
-            else:
+        if self._count is None or self._count > 0:
+            for i in gen:
+                if self._until and i > self._until:
+                    break
+                total += 1
+                yield i
+                if self._count is not None and total >= self._count:
+                    break
+        self._len = total
+
+    def _iter_bdays(self):
+        # Step straight from one business day to the next, the interval
+        # being a number of business days
+        o = _offset_bdays(self._dtstart.toordinal() - 1, 1, self.holidays,
+                          self.weekmask)
+        while True:
+            day = date.fromordinal(o)
+            for tod in self._timeset:
+                dt = datetime.combine(day, tod)
+                if dt >= self._dtstart:
+                    yield dt
+            o = _offset_bdays(o, self._interval, self.holidays,
+                              self.weekmask)
+
+    def _iter_filtered(self):
+        # Rules selecting dates can't be stepped through by business day so
+        # run them as a daily rule with an interval of one and without a
+        # count, then keep the business days falling on every interval-th
+        # business day from dtstart as the stepped rule would
+        rule = copy.copy(self)
+        rule._count = None
+        rule._interval = 1
+        first = _offset_bdays(self._dtstart.toordinal() - 1, 1,
+                              self.holidays, self.weekmask)
+        for i in rrulebase._iter(rule):
+            o = i.toordinal()
+            if _isbday(o, self.holidays, self.weekmask) and \
+                    (_count_bdays(first, o, self.holidays, self.weekmask) -
+                     1) % self._interval == 0:
+                yield i
+
+    def _iter_bybday(self):
+        # Step through the months of the rule and look up the business days
+        # of each one, the month tables of a BusinessCalendar make that a
+        # single lookup per occurrence
+        year, month = self._dtstart.year, self._dtstart.month
+        while year <= MAXYEAR:
+            if not self._bymonth or month in self._bymonth:
+                days = set(_nth_bday(year, month, n, self.holidays,
+                                     self.weekmask) for n in self._bybday)
+                days.discard(None)
+                for o in sorted(days):
+                    day = date.fromordinal(o)
+                    for tod in self._timeset:
+                        dt = datetime.combine(day, tod)
+                        if dt >= self._dtstart:
+                            yield dt
+            year, month = divmod(year * 12 + month - 1 + self._interval, 12)
+            month += 1
+
+    def _iter_btime(self):
+        # Move along the business clock, which goes straight from the end
+        # of a session to the start of the next one
+        sessions = _Sessions(self.sessions, self.btstart, self.btend,
+                             self.holidays)
+        dt = _add_btime(self._dtstart, 0, self.holidays, self.weekmask,
+                        sessions)
+        while True:
+            yield dt
+            dt = _add_btime(dt, self._btime, self.holidays, self.weekmask,
+                            sessions)
+
+    def _iter_rolled(self):
+        # Rolling never changes the order of the occurrences so rolled
+        # occurrences are only compared to the last one to drop those
+        # rolled onto the same date. until applies to the rolled dates and
+        # count to what is left.
+        rule = copy.copy(self)
+        rule._count = None
+        rule._until = None
+        last = None
+        for i in rrulebase._iter(rule):
+            o = i.toordinal()
+            i += timedelta(days=_roll(o, self.roll, self.holidays,
+                                      self.weekmask) - o)
+            if i != last:
+                last = i
                 yield i
-        return
+
+    def _bfirst(self):
+        """Return the ordinal of the first day of the rule along with the
+        number of times of day skipped on it for being before dtstart."""
+        o = _offset_bdays(self._dtstart.toordinal() - 1, 1, self.holidays,
+                          self.weekmask)
+        day = date.fromordinal(o)
+        return o, sum(datetime.combine(day, tod) < self._dtstart
+                      for tod in self._timeset)
+
+    def _bget(self, i):
+        """Return the i-th occurrence of a stepped rule."""
+        first, skip = self._bfirst()
+        days, i = divmod(i + skip, len(self._timeset))
+        o = _offset_bdays(first, days * self._interval, self.holidays,
+                          self.weekmask)
+        return datetime.combine(date.fromordinal(o), self._timeset[i])
+
+    def _bindex(self, dt, inc=False):
+        """Return the number of occurrences of a stepped rule before dt, or
+        up to and including dt if inc is True."""
+        if self._tzinfo is not None and dt.tzinfo is not None:
+            dt = dt.astimezone(self._tzinfo)
+        first, skip = self._bfirst()
+        o = dt.toordinal()
+        if o < first:
+            return 0
+        # Business days from the first one up to dt of which every
+        # interval-th one is a day of the rule
+        c = _count_bdays(first, o, self.holidays, self.weekmask)
+        days = (c - 1) // self._interval + 1
+        ret = days * len(self._timeset)
+        if (c - 1) % self._interval == 0 and \
+                _isbday(o, self.holidays, self.weekmask):
+            # dt falls on a day of the rule, only count the times up to dt
+            day = dt.date()
+            ret -= sum(datetime.combine(day, tod) > dt if inc
+                       else datetime.combine(day, tod) >= dt
+                       for tod in self._timeset)
+        return max(ret - skip, 0)
+
+    def _bcount(self):
+        """Return the number of occurrences of a stepped rule or None if it
+        has neither count nor until."""
+        ret = self._count
+        if self._until:
+            n = self._bindex(self._until, inc=True)
+            ret = n if ret is None else min(ret, n)
+        return ret
+
+    def _bclip(self, n):
+        """Return n capped to the number of occurrences of a stepped
+        rule."""
+        m = self._bcount()
+        return n if m is None else min(n, m)
+
+    def __getitem__(self, item):
+        if not self._bstep:
+            return rrulebase.__getitem__(self, item)
+        n = self._bcount()
+        if n is None:
+            n = sys.maxsize
+        if isinstance(item, slice):
+            return [self._bget(i) for i in range(*item.indices(n))]
+        if item < 0:
+            item += n
+        if not 0 <= item < n:
+            raise IndexError
+        return self._bget(item)
+
+    def __contains__(self, item):
+        if not self._bstep:
+            return rrulebase.__contains__(self, item)
+        if not isinstance(item, datetime):
+            return False
+        n = self._bindex(item)
+        return self._bclip(self._bindex(item, inc=True)) > n
+
+    def count(self):
+        if self._bstep:
+            n = self._bcount()
+            if n is not None:
+                return n
+        return rrulebase.count(self)
+
+    def before(self, dt, inc=False):
+        if not self._bstep:
+            return rrulebase.before(self, dt, inc)
+        n = self._bclip(self._bindex(dt, inc))
+        return self._bget(n - 1) if n else None
+
+    def after(self, dt, inc=False):
+        if not self._bstep:
+            return rrulebase.after(self, dt, inc)
+        n = self._bindex(dt, not inc)
+        return self._bget(n) if self._bclip(n + 1) > n else None
+
+    def between(self, after, before, inc=False, count=1):
+        if not self._bstep:
+            return rrulebase.between(self, after, before, inc, count)
+        return [self._bget(i)
+                for i in range(self._bindex(after, not inc),
+                               self._bclip(self._bindex(before, inc)))]
 
 
 # dateutil.rrule.rrulestr returns a dateutil.rrule.rrule object
@@ -0,0 +1,506 @@
+#  bdateutil
+#  -----------
+#  Adds business day logic and improved data type flexibility to
+#  python-dateutil. 100% backwards compatible with python-dateutil,
+#  simply replace dateutil imports with bdateutil.
+#
+#  Author:  ryanss <ryanssdev@icloud.com>
+#  Website: https://github.com/ryanss/bdateutil
+#  License: MIT (see LICENSE file)
+
+# Business day functions operating on whole NumPy arrays at once. NumPy is
+# an optional dependency and is only imported when one of these functions
+# is called so it does not slow down importing bdateutil.
+
+
+from datetime import date, datetime, time
+
+from bdateutil.bcalendar import BusinessCalendar
+from bdateutil.bcalendar import _DAY, _convention, _holiday_ordinals
+from bdateutil.bcalendar import _weekmask
+from bdateutil.parser import parse
+from bdateutil.relativedelta import _Sessions, _add_btime, _week_btime
+
+
+# Ordinal of 1970-01-01, day zero of datetime64
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required for vectorized business day "
+                          "functions")
+    return numpy
+
+
+def _datetime64(values):
+    """Return values as an array of datetime64. Anything other than an
+    array of datetime64 is converted one element at a time using parse,
+    to datetime64[D] if every element is a date or datetime64[us]
+    otherwise."""
+    np = _numpy()
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values
+    ret = [parse(v) for v in values.ravel()]
+    if any(isinstance(v, datetime) for v in ret):
+        ret = [v.replace(tzinfo=None) if isinstance(v, datetime)
+               else datetime(v.year, v.month, v.day) for v in ret]
+        return np.array(ret, dtype='datetime64[us]').reshape(values.shape)
+    return np.array(ret, dtype='datetime64[D]').reshape(values.shape)
+
+
+def _days(values):
+    """Return an array of datetime64 as an int64 array of days since
+    1970-01-01. NaT is returned as the lowest int64."""
+    return values.astype('datetime64[D]').view('int64')
+
+
+def _nat():
+    np = _numpy()
+    return np.iinfo(np.int64).min
+
+
+def _tables(holidays):
+    """Return the running count of business days before each day of the
+    calendar holidays and the list of its business days, both as arrays of
+    days since 1970-01-01."""
+    np = _numpy()
+    return np.asarray(holidays._before), np.asarray(holidays._bdays) - _EPOCH
+
+
+def _holiday_days(holidays, first, last, weekmask):
+    """Return the holidays between the days first and last as an array of
+    datetime64[D]."""
+    np = _numpy()
+    hols = _holiday_ordinals(holidays, int(first) + _EPOCH,
+                             int(last) + _EPOCH, weekmask)
+    return (np.array(hols, dtype='int64') - _EPOCH).view('datetime64[D]')
+
+
+def _offset(holidays, days, n, weekmask, roll):
+    """Return the days n business days after days, which are first rolled
+    forward or backward to a business day depending on roll."""
+    np = _numpy()
+    if not days.size:
+        return days
+    if isinstance(holidays, BusinessCalendar):
+        before, bdays = _tables(holidays)
+        first = holidays._first - _EPOCH
+        holidays._check(int(days.min()) + _EPOCH, int(days.max()) + _EPOCH)
+        if roll == 'forward':
+            i = before[days - first] + n
+        else:
+            i = before[days - first + 1] - 1 + n
+        if i.min() < 0 or i.max() >= len(bdays):
+            raise holidays._range_error()
+        return bdays[i]
+    # Only the holidays around the dates are needed, widen the window until
+    # it holds every rolled and offset date
+    pad = (int(np.abs(n).max()) // sum(weekmask) + 2) * 14
+    while True:
+        lo, hi = days.min() - pad, days.max() + pad
+        ret = np.busday_offset(days.view('datetime64[D]'), n, roll=roll,
+                               weekmask=weekmask,
+                               holidays=_holiday_days(holidays, lo, hi,
+                                                      weekmask))
+        ret = ret.view('int64')
+        if lo < ret.min() and ret.max() < hi:
+            return ret
+        pad *= 2
+
+
+def _bools(holidays, days, weekmask):
+    """Return a boolean array telling which of days, an array of days since
+    1970-01-01 with NaT filtered out, are business days."""
+    np = _numpy()
+    if not days.size:
+        return np.zeros(days.shape, dtype=bool)
+    if isinstance(holidays, BusinessCalendar):
+        i = days - (holidays._first - _EPOCH)
+        holidays._check(holidays._first + i.min(), holidays._first + i.max())
+        bitmap = np.frombuffer(holidays._bitmap, dtype=np.uint8)
+        return np.unpackbits(bitmap, bitorder='little').astype(bool)[i]
+    hols = _holiday_ordinals(holidays, int(days.min()) + _EPOCH,
+                             int(days.max()) + _EPOCH, weekmask)
+    hols = np.array(hols, dtype='int64') - _EPOCH
+    # 1970-01-01 was a Thursday
+    return np.array(weekmask)[(days + 3) % 7] & ~np.isin(days, hols)
+
+
+def isbday_array(values, holidays=None, weekmask=None):
+    """Vectorized isbday. Return a boolean array telling which of values
+    fall on a business day. values can be an array of datetime64 or any
+    sequence of values accepted by parse, which are converted once. NaT is
+    never a business day.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    np = _numpy()
+    if holidays is None:
+        holidays = getattr(isbday_array, 'holidays', ())
+    days = _days(_datetime64(values))
+    valid = days != _nat()
+    ret = np.zeros(days.shape, dtype=bool)
+    ret[valid] = _bools(holidays, days[valid], _weekmask(weekmask))
+    return ret
+
+
+def _add_bdays(dates, n, holidays, weekmask, sub):
+    np = _numpy()
+    dates = _datetime64(dates)
+    dates, n = np.broadcast_arrays(dates, np.asarray(n, dtype='int64'))
+    days = _days(dates)
+    weekmask = _weekmask(weekmask)
+    ret = np.full(days.shape, _nat(), dtype='int64')
+    forward = days != _nat()
+    if sub:
+        # Subtracting zero business days rolls backward to a business day,
+        # subtracting anything else is adding the negated number
+        backward = forward & (n == 0)
+        forward &= n != 0
+        n = -n
+        ret[backward] = _offset(holidays, days[backward], n[backward],
+                                weekmask, 'backward')
+    ret[forward] = _offset(holidays, days[forward], n[forward], weekmask,
+                           'forward')
+    # Move whole days so the time of day of each date is kept
+    return dates + (ret - days).astype('timedelta64[D]')
+
+
+def add_bdays(dates, n, holidays=None, weekmask=None):
+    """Vectorized date + relativedelta(bdays=n). Return an array of
+    datetime64 with n business days added to each of dates, each first
+    rolled forward to a business day, so n=0 rolls forward only. dates and
+    n are broadcast against each other and dates can be an array of
+    datetime64 or any sequence of values accepted by parse. The time of day
+    is kept and NaT stays NaT.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    if holidays is None:
+        holidays = getattr(add_bdays, 'holidays', ())
+    return _add_bdays(dates, n, holidays, weekmask, False)
+
+
+def sub_bdays(dates, n, holidays=None, weekmask=None):
+    """Vectorized date - relativedelta(bdays=n). Same as add_bdays with n
+    negated except n=0 rolls each of dates backward to a business day."""
+    if holidays is None:
+        holidays = getattr(sub_bdays, 'holidays', ())
+    return _add_bdays(dates, n, holidays, weekmask, True)
+
+
+def roll_array(dates, convention='following', holidays=None, weekmask=None):
+    """Vectorized roll. Return an array of datetime64 with each of dates
+    rolled to a business day following convention, one of 'following',
+    'modifiedfollowing', 'preceding' or 'modifiedpreceding'. dates can be
+    an array of datetime64 or any sequence of values accepted by parse. The
+    time of day is kept and NaT stays NaT.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    np = _numpy()
+    if holidays is None:
+        holidays = getattr(roll_array, 'holidays', ())
+    convention = _convention(convention)
+    weekmask = _weekmask(weekmask)
+    dates = _datetime64(dates)
+    days = _days(dates)
+    valid = days != _nat()
+    ret = np.full(days.shape, _nat(), dtype='int64')
+    forward = convention.endswith('following')
+    rolled = _offset(holidays, days[valid], 0, weekmask,
+                     'forward' if forward else 'backward')
+    if convention.startswith('modified'):
+        # Roll the other way wherever the month changed
+        month = (days[valid].view('datetime64[D]').astype('datetime64[M]') !=
+                 rolled.view('datetime64[D]').astype('datetime64[M]'))
+        rolled[month] = _offset(holidays, days[valid][month], 0, weekmask,
+                                'backward' if forward else 'forward')
+    ret[valid] = rolled
+    return dates + (ret - days).astype('timedelta64[D]')
+
+
+def count_bdays(start, end, holidays=None, weekmask=None):
+    """Vectorized relativedelta(end, start).bdays. Return an int64 array
+    with the number of business days from each of start to each of end,
+    negative where end is before start. start and end are broadcast against
+    each other and can be arrays of datetime64 or any sequences of values
+    accepted by parse.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    np = _numpy()
+    if holidays is None:
+        holidays = getattr(count_bdays, 'holidays', ())
+    start, end = np.broadcast_arrays(_datetime64(start), _datetime64(end))
+    if np.isnat(start).any() or np.isnat(end).any():
+        raise ValueError("Can't count business days from or to NaT")
+    weekmask = _weekmask(weekmask)
+    neg = start > end
+    d1 = np.where(neg, start, end)
+    d2 = np.where(neg, end, start)
+    days1, days2 = _days(d1), _days(d2)
+    # Like relativedelta, only count the days after d2 has been brought
+    # forward to the time of day of d1, plus one if d1 is not a business day
+    tod1 = d1 - days1.view('datetime64[D]')
+    tod2 = d2 - days2.view('datetime64[D]')
+    days2 = days2 + (tod2 > tod1)
+    ret = (~_bools(holidays, days1, weekmask)).astype('int64')
+    if not ret.size:
+        return ret
+    if isinstance(holidays, BusinessCalendar):
+        before = _tables(holidays)[0]
+        first = holidays._first - _EPOCH
+        holidays._check(int(days2.min()) + _EPOCH,
+                        int(days1.max()) + _EPOCH)
+        ret += before[days1 + 1 - first] - before[days2 + 1 - first]
+    else:
+        hols = _holiday_days(holidays, days2.min(), days1.max(), weekmask)
+        ret += np.busday_count((days2 + 1).view('datetime64[D]'),
+                               (days1 + 1).view('datetime64[D]'),
+                               weekmask=weekmask, holidays=hols)
+    return np.where(neg, -ret, ret)
+
+
+def _session_time(day, t):
+    """Return the business time of the compiled sessions day before each of
+    t, an array of microseconds after midnight."""
+    np = _numpy()
+    starts, ends, totals = [np.array(a, dtype='int64') for a in day]
+    if not starts.size:
+        return np.zeros(t.shape, dtype='int64')
+    i = np.searchsorted(starts, t, side='right')
+    j = np.maximum(i - 1, 0)
+    return np.where(i == 0, 0, totals[j] + np.minimum(t, ends[j]) - starts[j])
+
+
+def _session_at(day, b):
+    """Return the microseconds after midnight by which each of b of the
+    business time of the compiled sessions day has elapsed."""
+    np = _numpy()
+    starts, ends, totals = [np.array(a, dtype='int64') for a in day]
+    i = np.searchsorted(totals, b, side='right') - 1
+    return starts[i] + b - totals[i]
+
+
+def _day_btime(sessions, days, t):
+    """Return the business time of each of days before t microseconds after
+    their midnight along with the business time of the whole day."""
+    np = _numpy()
+    before = np.zeros(days.shape, dtype='int64')
+    total = np.array(sessions.lengths, dtype='int64')[(days + 3) % 7]
+    for wd in range(7):
+        # 1970-01-01 was a Thursday
+        i = (days + 3) % 7 == wd
+        before[i] = _session_time(sessions.days[wd], t[i])
+    # Dates with sessions of their own are few, look them up one by one
+    for i in np.flatnonzero(np.isin(days + _EPOCH, sessions.dates)):
+        o = int(days[i]) + _EPOCH
+        before[i] = sessions.before(o, int(t[i]))
+        total[i] = sessions.total(o)
+    return before, total
+
+
+def _bposition(holidays, values, weekmask, sessions):
+    """Vectorized relativedelta._bposition. Return the business day each of
+    values, an array of datetime64[us], is in as days since 1970-01-01 along
+    with the business time elapsed on it."""
+    np = _numpy()
+    days = _days(values)
+    t = (values - days.astype('datetime64[D]')).astype('int64')
+    # Each of values can be in a session of the day before that wraps
+    # midnight, in a session of its own day or before the next business day
+    prev, prev_total = _day_btime(sessions, days - 1, t + _DAY)
+    prev_open = (prev < prev_total) & _bools(holidays, days - 1, weekmask)
+    cur, cur_total = _day_btime(sessions, days, t)
+    cur_open = (cur < cur_total) & _bools(holidays, days, weekmask)
+    nxt = _offset(holidays, days + 1, 0, weekmask, 'forward')
+    return (np.where(prev_open, days - 1, np.where(cur_open, days, nxt)),
+            np.where(prev_open, prev, np.where(cur_open, cur, 0)))
+
+
+def _week_offset(holidays, days, b, weekmask, sessions):
+    """Vectorized relativedelta._forward_bdays and _backward_bdays. Return
+    the business day reached by b of business time from the start of each
+    of days, arrays of days since 1970-01-01, as days since 1970-01-01 along
+    with its business time elapsed by then. Dates with sessions of their own
+    are ignored."""
+    np = _numpy()
+    week = np.array(_week_btime(weekmask, sessions), dtype='int64')
+    lengths = np.diff(week)
+    o = days + _EPOCH
+
+    def before(o):
+        # Business time of the days before the ordinals o, holidays aside
+        weeks, i = np.divmod(o - 1, 7)
+        return weeks * week[7] + week[i]
+
+    # Only the holidays around the dates are needed, widen the window until
+    # it holds every date reached, a calendar holds all of its holidays
+    calendar = isinstance(holidays, BusinessCalendar)
+    pad = (int(np.abs(b).max()) // int(week[7]) + 2) * 14
+    while True:
+        if calendar:
+            lo, hi = holidays._first - 1, holidays._last + 1
+        else:
+            lo, hi = int(o.min()) - pad, int(o.max()) + pad
+        hols = np.array(_holiday_ordinals(holidays, lo + 1, hi - 1,
+                                          weekmask), dtype='int64')
+        # Business time of the holidays before each holiday and before each
+        # of days, the holidays before the day reached are those before
+        # which less business time than the target has elapsed
+        hol_time = np.concatenate([[0], np.cumsum(lengths[(hols - 1) % 7])])
+        target = before(o) - hol_time[np.searchsorted(hols, o)] + b
+        reached = before(hols) - hol_time[:-1]
+        t = target + hol_time[np.searchsorted(reached, target, side='right')]
+        weeks, t = np.divmod(t, week[7])
+        i = np.searchsorted(week, t, side='right') - 1
+        ret = weeks * 7 + i + 1
+        if lo < ret.min() and ret.max() < hi:
+            return ret - _EPOCH, t - week[i]
+        if calendar:
+            raise holidays._range_error()
+        pad *= 2
+
+
+def _btime_between(holidays, first, last, weekmask, sessions):
+    """Vectorized relativedelta._btime_between over arrays of days since
+    1970-01-01."""
+    np = _numpy()
+    length = sessions.length(weekmask)
+    if isinstance(holidays, BusinessCalendar) and length is not None:
+        before = _tables(holidays)[0]
+        start = holidays._first - _EPOCH
+        holidays._check(int(first.min()) + _EPOCH, int(last.max()) + _EPOCH)
+        ret = (before[last - start] - before[first - start]) * length
+    else:
+        hols = _holiday_days(holidays, first.min(), last.max(), weekmask)
+        ret = np.zeros(first.shape, dtype='int64')
+        for wd in range(7):
+            if weekmask[wd]:
+                # Count the business days one weekday at a time
+                mask = [i == wd for i in range(7)]
+                ret += sessions.lengths[wd] * np.busday_count(
+                    first.view('datetime64[D]'), last.view('datetime64[D]'),
+                    weekmask=mask, holidays=hols)
+    if len(sessions.dates):
+        # Running total of the business time added by the dates with
+        # sessions of their own
+        dates = np.asarray(sessions.dates, dtype='int64')
+        extra = [sessions.total(o) - sessions.lengths[(o - 1) % 7]
+                 for o in sessions.dates]
+        extra = np.concatenate([[0], np.cumsum(extra)])
+        ret += extra[np.searchsorted(dates, last + _EPOCH)] - \
+            extra[np.searchsorted(dates, first + _EPOCH)]
+    return ret
+
+
+def business_seconds_array(start, end, holidays=None, weekmask=None,
+                           btstart=None, btend=None, sessions=None):
+    """Vectorized business_seconds. Return an int64 array with the number
+    of seconds of business time from each of start to each of end,
+    negative where end is before start. start and end are broadcast against
+    each other and can be arrays of datetime64 or any sequences of values
+    accepted by parse.
+
+    Whole business days count for the length of their sessions and only
+    the days of start and end are partial, so every pair takes the same
+    time to score however far apart they are.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    np = _numpy()
+    if holidays is None:
+        holidays = getattr(business_seconds_array, 'holidays', ())
+    if btstart is None:
+        btstart = time(9)
+    if btend is None:
+        btend = time(17)
+    sessions = _Sessions(sessions, btstart, btend, holidays)
+    start, end = np.broadcast_arrays(_datetime64(start), _datetime64(end))
+    if np.isnat(start).any() or np.isnat(end).any():
+        raise ValueError("Can't count business time from or to NaT")
+    weekmask = _weekmask(weekmask, holidays)
+    neg = start > end
+    d1 = np.where(neg, end, start).astype('datetime64[us]')
+    d2 = np.where(neg, start, end).astype('datetime64[us]')
+    if not d1.size:
+        return np.zeros(d1.shape, dtype='int64')
+    o1, b1 = _bposition(holidays, d1, weekmask, sessions)
+    o2, b2 = _bposition(holidays, d2, weekmask, sessions)
+    ret = _btime_between(holidays, o1, o2, weekmask, sessions) - b1 + b2
+    ret //= 1000000
+    return np.where(neg, -ret, ret)
+
+
+def add_business_time(timestamps, seconds, holidays=None, weekmask=None,
+                      btstart=None, btend=None, sessions=None):
+    """Vectorized timestamp + relativedelta(bseconds=seconds). Return an
+    array of datetime64[us] with seconds of business time added to each of
+    timestamps, or subtracted where seconds is negative. timestamps and
+    seconds are broadcast against each other and timestamps can be an array
+    of datetime64 or any iterable of values accepted by parse. NaT stays
+    NaT.
+
+    As with relativedelta, timestamps outside of business hours are first
+    rolled forward to the next opening time and business time running out
+    at a closing time lands on the next opening time. Each result is a
+    division by the length of the business day and an offset by business
+    days, or a lookup in the business time of a week when the length of
+    business days depends on the weekday. Only the few timestamps whose
+    business time runs over a date with sessions of its own are moved one
+    at a time.
+
+    The weekmask only applies to plain holidays, a BusinessCalendar uses
+    its own."""
+    np = _numpy()
+    if holidays is None:
+        holidays = getattr(add_business_time, 'holidays', ())
+    if btstart is None:
+        btstart = time(9)
+    if btend is None:
+        btend = time(17)
+    sessions = _Sessions(sessions, btstart, btend, holidays)
+    weekmask = _weekmask(weekmask, holidays)
+    if not hasattr(timestamps, '__len__'):
+        timestamps = list(timestamps)
+    seconds = np.asarray(seconds)
+    if seconds.dtype.kind in 'iub':
+        us = seconds.astype('int64') * 1000000
+    else:
+        us = np.round(seconds * 1000000).astype('int64')
+    values, us = np.broadcast_arrays(
+        _datetime64(timestamps).astype('datetime64[us]'), us)
+    ret = np.full(values.shape, 'NaT', dtype='datetime64[us]')
+    valid = ~np.isnat(values)
+    values, us = values[valid], us[valid]
+    if not values.size:
+        return ret
+    days, b = _bposition(holidays, values, weekmask, sessions)
+    out = np.empty(values.shape, dtype='datetime64[us]')
+    length = sessions.length(weekmask)
+    if length is None:
+        ret_days, b = _week_offset(holidays, days, b + us, weekmask,
+                                   sessions)
+    else:
+        n, b = np.divmod(b + us, length)
+        ret_days = _offset(holidays, days, n, weekmask, 'forward')
+    # Dates with sessions of their own between the start and the end don't
+    # follow the sessions of their weekday
+    dates = np.asarray(sessions.dates, dtype='int64') - _EPOCH
+    slow = np.searchsorted(dates, np.minimum(days, ret_days)) != \
+        np.searchsorted(dates, np.maximum(days, ret_days), side='right')
+    t = np.zeros(values.shape, dtype='int64')
+    for wd in range(7):
+        i = ((ret_days + 3) % 7 == wd) & ~slow
+        t[i] = _session_at(sessions.days[wd], b[i])
+    out[:] = ret_days.astype('datetime64[D]') + t.astype('timedelta64[us]')
+    for i in np.flatnonzero(slow):
+        out[i] = _add_btime(values[i].item(), int(us[i]), holidays,
+                            weekmask, sessions)
+    ret[valid] = out
+    return ret
@@ -10,19 +10,45 @@
 
 
 import datetime as dt
+import pickle
 import unittest
 
 import holidays
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-from bdateutil import isbday
-from bdateutil import relativedelta
-from bdateutil import parse
+from bdateutil import business_seconds, isbday, nth_bday, roll
+from bdateutil import business_seconds_array, isbday_array
+from bdateutil import add_bdays, count_bdays, sub_bdays
+from bdateutil import add_business_time
+from bdateutil import BusinessCalendar
+from bdateutil import FrozenHolidays, freeze_holidays
+from bdateutil import BusinessDuration, relativedelta
+from bdateutil import parse, parse_many
 from bdateutil.rrule import *
 from bdateutil import date, datetime, time
 
 from testdateutil import *
 
 
+def requires_numpy(test):
+    """Skip a test method or every test of a test case when NumPy is not
+    installed. Python 2.6 has no unittest.skipIf so the tests are replaced
+    by ones doing nothing there."""
+    if np is not None:
+        return test
+    if hasattr(unittest, 'skipIf'):
+        return unittest.skipIf(True, "NumPy is not installed")(test)
+    if isinstance(test, type):
+        for name in dir(test):
+            if name.startswith('test'):
+                setattr(test, name, lambda self: None)
+        return test
+    return lambda self: None
+
+
 class TestIsBday(unittest.TestCase):
 
     def test_isbday(self):
@@ -42,6 +68,106 @@ class TestIsBday(unittest.TestCase):
         self.assertFalse(isbday(date(2014, 7, 4)))
         self.assertTrue(isbday(date(2014, 7, 4), holidays=holidays.CA()))
 
+    def test_weekmask(self):
+        sun_thu = "Sun Mon Tue Wed Thu"
+        self.assertFalse(isbday(date(2015, 7, 3), holidays=(),
+                                weekmask=sun_thu))
+        self.assertTrue(isbday(date(2015, 7, 5), holidays=(),
+                               weekmask=sun_thu))
+        self.assertTrue(isbday(date(2015, 7, 4), holidays=(),
+                               weekmask="1111110"))
+        cal = BusinessCalendar(weekmask="0111111", years=2015)
+        self.assertFalse(isbday(date(2015, 7, 6), holidays=cal))
+        self.assertTrue(isbday(date(2015, 7, 5), holidays=cal))
+
+
+class TestRoll(unittest.TestCase):
+
+    def test_roll(self):
+        # Saturday 2015-05-30 is followed by Monday 2015-06-01
+        sat = date(2015, 5, 30)
+        self.assertEqual(roll(sat, holidays=()), date(2015, 6, 1))
+        self.assertEqual(roll(sat, "following", ()), date(2015, 6, 1))
+        self.assertEqual(roll(sat, "modifiedfollowing", ()),
+                         date(2015, 5, 29))
+        self.assertEqual(roll(sat, "preceding", ()), date(2015, 5, 29))
+        self.assertEqual(roll(sat, "modifiedpreceding", ()),
+                         date(2015, 5, 29))
+        self.assertEqual(roll(date(2015, 8, 1), "modifiedpreceding", ()),
+                         date(2015, 8, 3))
+        for convention in ("following", "modifiedfollowing", "preceding",
+                           "modifiedpreceding"):
+            self.assertEqual(roll(date(2015, 5, 29), convention, ()),
+                             date(2015, 5, 29))
+        self.assertRaises(ValueError, lambda: roll(sat, "nearest"))
+
+    def test_types(self):
+        self.assertEqual(roll("2015-05-30", "preceding", ()),
+                         datetime(2015, 5, 29))
+        self.assertEqual(roll(datetime(2015, 5, 30, 10, 30), holidays=()),
+                         datetime(2015, 6, 1, 10, 30))
+
+    def test_holidays(self):
+        us = holidays.US()
+        self.assertEqual(roll(date(2015, 7, 3), holidays=us),
+                         date(2015, 7, 6))
+        self.assertEqual(roll(date(2015, 7, 3), "preceding", us),
+                         date(2015, 7, 2))
+        cal = BusinessCalendar(us, years=range(2010, 2020))
+        self.assertEqual(roll(date(2014, 12, 31), holidays=cal),
+                         date(2014, 12, 31))
+        self.assertEqual(roll(date(2016, 1, 1), "modifiedpreceding", cal),
+                         date(2016, 1, 4))
+        self.assertEqual(roll(date(2015, 5, 29), holidays=cal,
+                              weekmask="Sun Mon Tue Wed Thu"),
+                         date(2015, 5, 29))
+        self.assertEqual(roll(date(2015, 5, 29), holidays=(),
+                              weekmask="Sun Mon Tue Wed Thu"),
+                         date(2015, 5, 31))
+
+    @requires_numpy
+    def test_array(self):
+        dates = np.array(["2015-05-30T10:30", "2015-07-03T09:00", "NaT"],
+                         dtype="datetime64[m]")
+        ret = roll(dates, "modifiedfollowing", holidays.US())
+        self.assertEqual(ret.dtype, dates.dtype)
+        self.assertEqual(ret[:2].tolist(), [datetime(2015, 5, 29, 10, 30),
+                                            datetime(2015, 7, 6, 9, 0)])
+        self.assertTrue(np.isnat(ret[2]))
+        self.assertEqual(roll(["2015-05-30", date(2015, 8, 1)],
+                              "preceding", ()).tolist(),
+                         [datetime(2015, 5, 29), datetime(2015, 7, 31)])
+
+
+class TestNthBday(unittest.TestCase):
+
+    def test_nth_bday(self):
+        self.assertEqual(nth_bday(2015, 7, 1, ()), date(2015, 7, 1))
+        self.assertEqual(nth_bday(2015, 7, 3, ()), date(2015, 7, 3))
+        self.assertEqual(nth_bday(2015, 7, 3, holidays.US()),
+                         date(2015, 7, 6))
+        self.assertEqual(nth_bday(2015, 5, -1, ()), date(2015, 5, 29))
+        self.assertEqual(nth_bday(2015, 5, -1, holidays.US()),
+                         date(2015, 5, 29))
+        self.assertEqual(nth_bday(2015, 5, -21, ()), date(2015, 5, 1))
+        self.assertEqual(nth_bday(2015, 8, 1, (),
+                                  weekmask="Sun Mon Tue Wed Thu"),
+                         date(2015, 8, 2))
+        self.assertRaises(ValueError, lambda: nth_bday(2015, 5, 22, ()))
+        self.assertRaises(ValueError, lambda: nth_bday(2015, 5, -22, ()))
+        self.assertRaises(ValueError, lambda: nth_bday(2015, 5, 0, ()))
+
+    def test_calendar(self):
+        us = holidays.US()
+        cal = BusinessCalendar(us, years=range(2010, 2020))
+        for year in (2010, 2015, 2019):
+            for month in range(1, 13):
+                for n in (1, 2, 3, 19, -1, -2, -19):
+                    self.assertEqual(nth_bday(year, month, n, cal),
+                                     nth_bday(year, month, n, us))
+        self.assertRaises(ValueError, lambda: nth_bday(2015, 5, 22, cal))
+        self.assertRaises(ValueError, lambda: nth_bday(2020, 1, 1, cal))
+
 
 class TestRelativeDelta(unittest.TestCase):
 
@@ -56,6 +182,14 @@ class TestRelativeDelta(unittest.TestCase):
                          relativedelta(months=1, days=1, bdays=23))
         self.assertEqual(relativedelta(date(2014, 1, 1), date(2014, 2, 2)),
                          relativedelta(months=-1, days=-1, bdays=-23))
+        self.assertEqual(relativedelta(date(2044, 1, 1),
+                                       date(2014, 1, 1)).bdays, 7827)
+        self.assertEqual(relativedelta(date(2014, 1, 1),
+                                       date(2044, 1, 1)).bdays, -7827)
+        self.assertEqual(relativedelta(date(2015, 1, 1), date(2014, 1, 1),
+                                       holidays=holidays.US()).bdays, 252)
+        self.assertEqual(relativedelta(date(2014, 7, 7), date(2014, 7, 3),
+                                       holidays=[date(2014, 7, 4)]).bdays, 1)
 
     def test_init_time(self):
         self.assertEqual(relativedelta(datetime(2015, 1, 5, 9, 15),
@@ -77,6 +211,16 @@ class TestRelativeDelta(unittest.TestCase):
                          relativedelta(days=11, hours=18, minutes=22,
                                        bdays=6, bhours=8, bminutes=0))
         del relativedelta.holidays
+        self.assertEqual(relativedelta(datetime(2014, 1, 13, 12, 30, 15),
+                                       datetime(2014, 1, 6, 9)),
+                         relativedelta(days=7, hours=3, minutes=30,
+                                       seconds=15, bdays=5, bhours=3,
+                                       bminutes=30, bseconds=15))
+        self.assertEqual(relativedelta(datetime(2014, 1, 6, 9),
+                                       datetime(2014, 1, 13, 12, 30, 15)),
+                         relativedelta(days=-7, hours=-3, minutes=-30,
+                                       seconds=-15, bdays=-5, bhours=-3,
+                                       bminutes=-30, bseconds=-15))
         self.assertEqual(relativedelta(time(3, 40), time(2, 37)),
                          relativedelta(hours=1, minutes=3))
 
@@ -122,6 +266,17 @@ class TestRelativeDelta(unittest.TestCase):
                          date(2014, 1, 7))
         self.assertEqual(date(2014, 1, 3) + relativedelta(bdays=1.5),
                          datetime(2014, 1, 6, 13, 0))
+        self.assertEqual(date(2014, 1, 1) + relativedelta(bdays=+2500),
+                         date(2023, 8, 2))
+        self.assertEqual(date(2014, 1, 1) + relativedelta(bdays=-2500),
+                         date(2004, 6, 2))
+        self.assertEqual(date(2014, 1, 1)
+                         + relativedelta(bdays=+2500, holidays=holidays.US()),
+                         date(2023, 12, 22))
+        hols = [date(2014, 12, 25), date(2014, 12, 26)]
+        self.assertEqual(date(2014, 12, 24)
+                         + relativedelta(bdays=1, holidays=hols),
+                         date(2014, 12, 29))
 
     def test_radd_time(self):
         self.assertEqual("2015-01-02 16:45" + relativedelta(bminutes=+30),
@@ -130,6 +285,18 @@ class TestRelativeDelta(unittest.TestCase):
                          datetime(2015, 1, 2, 9, 30))
         self.assertEqual(date(2014, 1, 3) + relativedelta(bdays=1, bhours=4),
                          datetime(2014, 1, 6, 13, 0))
+        self.assertEqual("2011-12-16 09:52" + relativedelta(bhours=+8),
+                         datetime(2011, 12, 19, 9, 52))
+        self.assertEqual("2011-05-16 09:11" + relativedelta(bhours=-1),
+                         datetime(2011, 5, 13, 16, 11))
+        self.assertEqual("2014-01-04 10:00" + relativedelta(bhours=+1),
+                         datetime(2014, 1, 6, 10, 0))
+        self.assertEqual("2014-01-06 09:00"
+                         + relativedelta(bseconds=+5 * 8 * 60 * 60),
+                         datetime(2014, 1, 13, 9, 0))
+        self.assertEqual("2010-11-05 14:25"
+                         + relativedelta(bhours=+27, holidays=holidays.US()),
+                         datetime(2010, 11, 12, 9, 25))
         relativedelta.btstart = time(7, 30)
         self.assertEqual("2015-01-02 16:45" + relativedelta(bminutes=+30),
                          datetime(2015, 1, 5, 7, 45))
@@ -160,11 +327,202 @@ class TestRelativeDelta(unittest.TestCase):
                          datetime(2014, 11, 14))
         self.assertEqual(date.today() - relativedelta(bdays=+45),
                          date.today() + relativedelta(bdays=-45))
+        self.assertEqual(date(2014, 7, 7)
+                         - relativedelta(bdays=2, holidays=holidays.US()),
+                         date(2014, 7, 2))
+        self.assertEqual("2014-07-05"
+                         - relativedelta(bdays=0, holidays=holidays.US()),
+                         datetime(2014, 7, 3))
+        self.assertEqual("2014-01-06 10:30" - relativedelta(bhours=2),
+                         datetime(2014, 1, 3, 16, 30))
+
+    def test_weekmask(self):
+        sun_thu = "Sun Mon Tue Wed Thu"
+        self.assertEqual(date(2015, 7, 1) + relativedelta(bdays=2,
+                                                          weekmask=sun_thu),
+                         date(2015, 7, 5))
+        self.assertEqual(date(2015, 7, 5) - relativedelta(bdays=1,
+                                                          weekmask=sun_thu),
+                         date(2015, 7, 2))
+        self.assertEqual(date(2015, 7, 3) - relativedelta(bdays=0,
+                                                          weekmask=sun_thu),
+                         date(2015, 7, 2))
+        self.assertEqual(date(2015, 7, 3) + relativedelta(bdays=1,
+                                                          weekmask="1111110"),
+                         date(2015, 7, 4))
+        self.assertEqual(relativedelta(date(2015, 7, 12), date(2015, 7, 1),
+                                       weekmask=sun_thu).bdays, 7)
+        self.assertEqual(datetime(2015, 7, 2, 16) +
+                         relativedelta(bhours=2, weekmask=sun_thu),
+                         datetime(2015, 7, 5, 10))
+        cal = BusinessCalendar(weekmask=sun_thu, years=2015)
+        self.assertEqual(relativedelta(bdays=1, holidays=cal).weekmask,
+                         cal.weekmask)
+        self.assertEqual((-relativedelta(bdays=1, weekmask=sun_thu)).weekmask,
+                         cal.weekmask)
+
+    def test_holidays_changed(self):
+        hols = [date(2015, 7, 3)]
+        self.assertEqual(date(2015, 7, 2) + relativedelta(bdays=1,
+                                                          holidays=hols),
+                         date(2015, 7, 6))
+        hols.append(date(2015, 7, 6))
+        self.assertEqual(date(2015, 7, 2) + relativedelta(bdays=1,
+                                                          holidays=hols),
+                         date(2015, 7, 7))
+        # Replacing a holiday keeps the length the same
+        hols = [date(2015, 7, 3)]
+        self.assertEqual(date(2015, 7, 2) + relativedelta(bdays=1,
+                                                          holidays=hols),
+                         date(2015, 7, 6))
+        hols[0] = date(2015, 7, 6)
+        self.assertEqual(date(2015, 7, 2) + relativedelta(bdays=1,
+                                                          holidays=hols),
+                         date(2015, 7, 3))
+        hols = set([date(2015, 7, 3)])
+        self.assertEqual(relativedelta(date(2015, 7, 7), date(2015, 7, 1),
+                                       holidays=hols).bdays, 3)
+        hols.remove(date(2015, 7, 3))
+        hols.add(date(2015, 7, 6))
+        self.assertEqual(relativedelta(date(2015, 7, 7), date(2015, 7, 1),
+                                       holidays=hols).bdays, 3)
+        self.assertFalse(isbday(date(2015, 7, 6), holidays=hols))
+        self.assertEqual(date(2015, 7, 3) + relativedelta(bdays=1,
+                                                          holidays=hols),
+                         date(2015, 7, 7))
+        # Years not generated yet by a holidays object are filled in
+        us = holidays.US()
+        self.assertEqual(relativedelta(date(2015, 1, 5), date(2015, 1, 1),
+                                       holidays=us).bdays, 2)
+        self.assertEqual(date(2030, 12, 24) + relativedelta(bdays=1,
+                                                            holidays=us),
+                         date(2030, 12, 26))
+
+    def test_sessions(self):
+        lunch = [(dt.time(13), dt.time(15)), (dt.time(9), dt.time(11, 30))]
+        self.assertEqual("2014-01-02 11:00"
+                         + relativedelta(bhours=+1, sessions=lunch),
+                         datetime(2014, 1, 2, 13, 30))
+        self.assertEqual("2014-01-02 12:00"
+                         + relativedelta(bminutes=+30, sessions=lunch),
+                         datetime(2014, 1, 2, 13, 30))
+        self.assertEqual("2014-01-02 14:00"
+                         + relativedelta(bhours=+6, sessions=lunch),
+                         datetime(2014, 1, 6, 9, 30))
+        self.assertEqual("2014-01-02 13:00"
+                         + relativedelta(bminutes=-30, sessions=lunch),
+                         datetime(2014, 1, 2, 11, 0))
+        self.assertEqual(relativedelta("2014-01-02 14:00", "2014-01-02 10:00",
+                                       sessions=lunch),
+                         relativedelta(hours=+4, bhours=+2, bminutes=+30))
+        self.assertEqual(relativedelta("2014-01-03 10:00", "2014-01-02 14:00",
+                                       sessions=lunch),
+                         relativedelta(hours=+20, bhours=+2))
+        self.assertEqual(relativedelta(bdays=+1.5, sessions=lunch),
+                         relativedelta(bdays=+1, bhours=+2, bminutes=+15))
+        self.assertEqual(-relativedelta(bhours=+1, sessions=lunch),
+                         relativedelta(bhours=-1, sessions=lunch))
+        # Fridays close at noon
+        week = dict((d, [(dt.time(9), dt.time(17))]) for d in (MO, TU, WE, TH))
+        week[FR] = [(dt.time(9), dt.time(12))]
+        self.assertEqual("2014-01-03 11:00"
+                         + relativedelta(bhours=+2, sessions=week),
+                         datetime(2014, 1, 6, 10, 0))
+        self.assertEqual("2014-01-06 10:00"
+                         + relativedelta(bhours=-2, sessions=week),
+                         datetime(2014, 1, 3, 11, 0))
+        self.assertEqual("2014-01-02 16:00"
+                         + relativedelta(bhours=+12, sessions=week),
+                         datetime(2014, 1, 7, 9, 0))
+        # 35 business hours a week
+        self.assertEqual("2014-01-06 09:00"
+                         + relativedelta(bhours=+35 * 100, sessions=week),
+                         datetime(2015, 12, 7, 9, 0))
+        self.assertEqual("2014-01-06 09:00"
+                         + relativedelta(bhours=+35 * 100, sessions=week,
+                                         holidays=[date(2014, 1, 10)]),
+                         datetime(2015, 12, 7, 12, 0))
+        self.assertEqual("2015-12-07 12:00"
+                         + relativedelta(bhours=-35 * 100, sessions=week,
+                                         holidays=[date(2014, 1, 10)]),
+                         datetime(2014, 1, 6, 9, 0))
+        self.assertEqual("2015-12-07 12:00"
+                         + relativedelta(bhours=-35 * 100 - 1, sessions=week,
+                                         holidays=[date(2014, 1, 10)]),
+                         datetime(2014, 1, 3, 11, 0))
+        self.assertRaises(ValueError, lambda: relativedelta(bdays=+1.5,
+                                                            sessions=week))
+        self.assertRaises(ValueError, lambda: "2014-01-02" +
+                          relativedelta(bhours=+1,
+                                        sessions={SA: week[FR]}))
+        self.assertRaises(ValueError, lambda: "2014-01-02" +
+                          relativedelta(bhours=+1,
+                                        sessions=[(dt.time(9), dt.time(12)),
+                                                  (dt.time(11),
+                                                   dt.time(13))]))
+        relativedelta.sessions = lunch
+        self.assertEqual("2014-01-02 11:00" + relativedelta(bhours=+1),
+                         datetime(2014, 1, 2, 13, 30))
+        del relativedelta.sessions
+
+    def test_overnight(self):
+        # The shift of Friday 2014-01-03 runs until Saturday 06:00
+        night = {'btstart': dt.time(22), 'btend': dt.time(6)}
+        self.assertEqual("2014-01-03 23:00"
+                         + relativedelta(bhours=+4, **night),
+                         datetime(2014, 1, 4, 3, 0))
+        self.assertEqual("2014-01-04 03:00"
+                         + relativedelta(bhours=+4, **night),
+                         datetime(2014, 1, 6, 23, 0))
+        self.assertEqual("2014-01-04 12:00"
+                         + relativedelta(bhours=+1, **night),
+                         datetime(2014, 1, 6, 23, 0))
+        self.assertEqual("2014-01-07 01:00"
+                         + relativedelta(bhours=-4, **night),
+                         datetime(2014, 1, 4, 5, 0))
+        # Monday's shift is a holiday
+        self.assertEqual("2014-01-07 01:00"
+                         + relativedelta(bhours=+2,
+                                         holidays=[date(2014, 1, 6)],
+                                         **night),
+                         datetime(2014, 1, 8, 0, 0))
+        self.assertEqual("2014-01-03 22:00"
+                         + relativedelta(bdays=+1, bhours=+1, **night),
+                         datetime(2014, 1, 6, 23, 0))
+        self.assertEqual(relativedelta("2014-01-07 05:00", "2014-01-06 23:00",
+                                       **night),
+                         relativedelta(hours=+6, bhours=+6))
+        self.assertEqual(relativedelta(bdays=+0.5, **night),
+                         relativedelta(bhours=+4))
+        # Around the clock from Sunday 17:00 to Friday 17:00
+        fx = {'sessions': [(dt.time(17), dt.time(17))],
+              'weekmask': "Sun Mon Tue Wed Thu"}
+        self.assertEqual("2014-01-03 16:00" + relativedelta(bhours=+2, **fx),
+                         datetime(2014, 1, 5, 18, 0))
+        self.assertEqual("2014-01-04 12:00" + relativedelta(bhours=+48, **fx),
+                         datetime(2014, 1, 7, 17, 0))
 
     def test_neg(self):
         self.assertEqual(-relativedelta(years=+1, bdays=-3),
                          relativedelta(years=-1, bdays=+3))
 
+    def test_arithmetic_settings(self):
+        r = relativedelta(bdays=+1, weekmask="Sun Mon Tue Wed Thu")
+        for delta in (r + relativedelta(days=0), relativedelta(days=0) + r,
+                      r - relativedelta(days=0), r * 1, 1 * r):
+            self.assertEqual(date(2015, 7, 2) + delta, date(2015, 7, 5))
+        r = relativedelta(bdays=+1, holidays=[date(2015, 7, 3)])
+        self.assertEqual(date(2015, 7, 2) + r * 2, date(2015, 7, 7))
+        lunch = [(dt.time(9), dt.time(12)), (dt.time(13, 30), dt.time(17))]
+        r = relativedelta(bhours=+1, sessions=lunch)
+        self.assertEqual("2014-01-02 11:00" + (r + relativedelta(bminutes=0)),
+                         datetime(2014, 1, 2, 13, 30))
+        self.assertEqual("2014-01-02 11:00" + r * 1,
+                         datetime(2014, 1, 2, 13, 30))
+        r = relativedelta(bhours=+1, btstart=dt.time(8), btend=dt.time(12))
+        self.assertEqual("2014-01-02 11:30" + r * 1,
+                         datetime(2014, 1, 3, 8, 30))
+
     def test_bool(self):
         self.assertTrue(relativedelta(bdays=1))
         self.assertTrue(relativedelta(days=1))
@@ -177,6 +535,8 @@ class TestRelativeDelta(unittest.TestCase):
                          relativedelta(years=-3, bdays=+9))
         self.assertEqual(relativedelta(years=+1, bdays=-3) * 0,
                          relativedelta(years=0, bdays=0))
+        self.assertEqual(relativedelta(bhours=+3, bminutes=+10) * 0.5,
+                         relativedelta(bhours=+1, bminutes=+35))
 
     def test_rmul(self):
         self.assertEqual(3 * relativedelta(years=+1, bdays=-3),
@@ -185,6 +545,7 @@ class TestRelativeDelta(unittest.TestCase):
                          relativedelta(years=-3, bdays=+9))
         self.assertEqual(0 * relativedelta(years=+1, bdays=-3),
                          relativedelta(years=0, bdays=0))
+        self.assertEqual((3 * relativedelta(years=+1, bdays=-3)).bdays, -9)
 
     def test_eq(self):
         r1 = relativedelta(years=1, months=2, days=3, bdays=1,
@@ -249,6 +610,80 @@ class TestRelativeDelta(unittest.TestCase):
                          "relativedelta(year=2014, month=1, day=2)")
 
 
+class TestBusinessDuration(unittest.TestCase):
+
+    def test_init(self):
+        self.assertEqual(BusinessDuration(bhours=2, bminutes=3, bseconds=4)
+                         .seconds, 7384)
+        self.assertEqual(BusinessDuration(bhours=1.5).seconds, 5400)
+        self.assertEqual(BusinessDuration().seconds, 0)
+        self.assertFalse(BusinessDuration())
+        self.assertTrue(BusinessDuration(bseconds=-1))
+
+    def test_arithmetic(self):
+        a = BusinessDuration(bhours=2)
+        b = BusinessDuration(bminutes=30)
+        self.assertEqual(a + b, BusinessDuration(bminutes=150))
+        self.assertEqual(a - b, BusinessDuration(bminutes=90))
+        self.assertEqual(b - a, BusinessDuration(bminutes=-90))
+        self.assertEqual(-a, BusinessDuration(bhours=-2))
+        self.assertEqual(abs(-a), a)
+        self.assertEqual(a * 3, BusinessDuration(bhours=6))
+        self.assertEqual(3 * a, BusinessDuration(bhours=6))
+        self.assertEqual(a * 0.25, b)
+        self.assertEqual(sum([a, b, b], BusinessDuration()),
+                         BusinessDuration(bhours=3))
+        self.assertRaises(TypeError, lambda: a + 1)
+        self.assertRaises(TypeError, lambda: a * a)
+
+    def test_compare(self):
+        a = BusinessDuration(bhours=2)
+        b = BusinessDuration(bminutes=120)
+        c = BusinessDuration(bminutes=121)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertNotEqual(a, 7200)
+        self.assertTrue(a < c)
+        self.assertTrue(a <= b)
+        self.assertTrue(c > a)
+        self.assertTrue(c >= a)
+        self.assertFalse(a > b)
+        self.assertEqual(sorted([c, -a, b]), [-a, a, c])
+        self.assertEqual(len(set([a, b, c])), 2)
+        self.assertEqual(hash(a), hash(b))
+
+    def test_relativedelta(self):
+        self.assertEqual(BusinessDuration(bhours=2, bseconds=-5)
+                         .to_relativedelta(),
+                         relativedelta(bhours=1, bminutes=59, bseconds=55))
+        self.assertEqual(BusinessDuration(bminutes=-61).to_relativedelta(),
+                         relativedelta(bhours=-1, bminutes=-1))
+        self.assertEqual("2014-01-03 16:00" + BusinessDuration(bhours=2)
+                         .to_relativedelta(holidays=holidays.US()),
+                         datetime(2014, 1, 6, 10, 0))
+        self.assertEqual(BusinessDuration.from_relativedelta(
+                         relativedelta(bdays=2, bhours=1, bseconds=30)),
+                         BusinessDuration(bhours=17, bseconds=30))
+        self.assertEqual(BusinessDuration.from_relativedelta(
+                         relativedelta(bdays=1, btstart=dt.time(8))),
+                         BusinessDuration(bhours=9))
+        self.assertEqual(BusinessDuration.from_relativedelta(
+                         relativedelta(datetime(2014, 1, 7, 10),
+                                       datetime(2014, 1, 2, 15))),
+                         BusinessDuration(bhours=19))
+        self.assertEqual(BusinessDuration.from_relativedelta(
+                         relativedelta(days=3)), BusinessDuration())
+
+    def test_repr(self):
+        self.assertEqual(repr(BusinessDuration(bhours=-2, bseconds=-5)),
+                         "BusinessDuration(bhours=-2, bseconds=-5)")
+        self.assertEqual(repr(BusinessDuration()), "BusinessDuration()")
+        a = BusinessDuration(bminutes=90)
+        self.assertEqual(eval(repr(a)), a)
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+        self.assertRaises(AttributeError, setattr, a, "days", 1)
+
+
 class TestParser(unittest.TestCase):
 
     def test_timestamp(self):
@@ -266,6 +701,119 @@ class TestParser(unittest.TestCase):
         self.assertRaises(ValueError, lambda: parse("abc"))
         self.assertRaises(TypeError, lambda: parse(['a', 'b', 'c']))
 
+    def test_iso(self):
+        self.assertEqual(parse("2014-01-02", cache=False),
+                         datetime(2014, 1, 2))
+        self.assertEqual(parse("20140102", cache=False),
+                         datetime(2014, 1, 2))
+        self.assertEqual(parse("2014-01-02T10:20", cache=False),
+                         datetime(2014, 1, 2, 10, 20))
+        self.assertEqual(parse("2014-01-02 10:20:30.5", cache=False),
+                         datetime(2014, 1, 2, 10, 20, 30, 500000))
+        dt = parse("2014-01-02T10:20:30.123456-05:00", cache=False)
+        self.assertEqual(dt, datetime(2014, 1, 2, 10, 20, 30, 123456,
+                                      tzinfo=tzoffset(None, -18000)))
+        self.assertEqual(dt.tzinfo, tzoffset(None, -18000))
+        self.assertEqual(parse("2014-01-02T10:20:30+0530", cache=False),
+                         datetime(2014, 1, 2, 10, 20, 30,
+                                  tzinfo=tzoffset(None, 19800)))
+        # Keyword arguments and anything else go through dateutil
+        self.assertEqual(parse("2014-01-02", dayfirst=True, cache=False),
+                         datetime(2014, 2, 1))
+        self.assertEqual(parse("2014-01-02", cache=False,
+                               default=datetime(2000, 1, 1, 9)),
+                         datetime(2014, 1, 2, 9))
+        self.assertEqual(parse("2014-1-2", cache=False),
+                         datetime(2014, 1, 2))
+        self.assertRaises(ValueError,
+                          lambda: parse("2014-02-30", cache=False))
+
+    def test_parse_many(self):
+        self.assertEqual(list(parse_many(["1/2/2014", "12/31/2014"])),
+                         [datetime(2014, 1, 2), datetime(2014, 12, 31)])
+        # Values not matching the format of the batch are parsed one by one
+        self.assertEqual(list(parse_many(["2014-01-02", "2014-01-03 10:00",
+                                          b"Jan 4 2014", date(2014, 1, 5)])),
+                         [datetime(2014, 1, 2), datetime(2014, 1, 3, 10),
+                          datetime(2014, 1, 4), date(2014, 1, 5)])
+        self.assertEqual(list(parse_many(["1/2/2014"], dayfirst=True)),
+                         [datetime(2014, 2, 1)])
+        self.assertRaises(ValueError, lambda: list(parse_many(["2014-02-30"])))
+
+    def test_parse_many_generator(self):
+        dates = ("2014-01-%02d" % day for day in range(1, 32))
+        ret = parse_many(dates, sample=5)
+        self.assertEqual(next(ret), datetime(2014, 1, 1))
+        self.assertEqual(len(list(dates)), 26)
+        self.assertEqual(list(ret), [datetime(2014, 1, 2),
+                                     datetime(2014, 1, 3),
+                                     datetime(2014, 1, 4),
+                                     datetime(2014, 1, 5)])
+
+    @requires_numpy
+    def test_parse_many_datetime64(self):
+        self.assertEqual(
+            parse_many(["20140102", "20140103"], datetime64=True).tolist(),
+            [datetime(2014, 1, 2), datetime(2014, 1, 3)])
+
+    def test_cache(self):
+        parse.cache.clear()
+        self.assertEqual(parse("2014-01-01"), datetime(2014, 1, 1))
+        self.assertEqual(parse("2014-01-01"), datetime(2014, 1, 1))
+        self.assertEqual(parse("1/2/2014", dayfirst=True),
+                         datetime(2014, 2, 1))
+        self.assertEqual(parse("1/2/2014"), datetime(2014, 1, 2))
+        info = parse.cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 3, 3))
+        self.assertEqual(parse("2014-01-01", cache=False),
+                         datetime(2014, 1, 1))
+        self.assertEqual(parse.cache.info().hits, 1)
+        # Unhashable arguments skip the cache
+        est = tzoffset('EST', -18000)
+        self.assertEqual(parse("2014-01-01 10:00 EST", tzinfos={'EST': est}),
+                         datetime(2014, 1, 1, 10, tzinfo=est))
+        self.assertEqual(parse.cache.info().currsize, 3)
+
+    def test_cache_today(self):
+        # Strings completed from today's date aren't reused the next day
+        import bdateutil.parser
+
+        class tomorrow(dt.date):
+
+            @classmethod
+            def today(cls):
+                return dt.date.today() + dt.timedelta(days=1)
+
+        parse.cache.clear()
+        today = parse("10:30")
+        bdateutil.parser.date = tomorrow
+        try:
+            self.assertEqual(parse("10:30"), today + dt.timedelta(days=1))
+            self.assertEqual(parse("2014-01-01"), datetime(2014, 1, 1))
+        finally:
+            bdateutil.parser.date = dt.date
+        self.assertEqual(parse("10:30"), today)
+        self.assertEqual(parse("10:30", default=datetime(2014, 1, 1)),
+                         datetime(2014, 1, 1, 10, 30))
+
+    def test_cache_size(self):
+        parse.cache.clear()
+        parse.cache.maxsize = 2
+        try:
+            parse("2014-01-01")
+            parse("2014-01-02")
+            parse("2014-01-01")
+            parse("2014-01-03")
+            self.assertEqual(parse.cache.info().currsize, 2)
+            parse("2014-01-01")
+            parse("2014-01-02")
+            self.assertEqual(parse.cache.info()[:2], (2, 4))
+            parse.cache.maxsize = 0
+            parse("2014-01-01")
+            self.assertEqual(parse.cache.info()[:2], (2, 4))
+        finally:
+            parse.cache.maxsize = 4096
+
 
 class TestRRule(unittest.TestCase):
 
@@ -318,6 +866,730 @@ class TestRRule(unittest.TestCase):
                           datetime(2015, 7, 7, 0, 0)])
         del rrule.holidays
 
+    def test_count(self):
+        # Holidays and weekends can't make a rule come up short
+        hols = [date(2015, 7, 3), date(2015, 7, 6), date(2015, 7, 7)]
+        self.assertEqual(list(rrule(BDAILY, count=2, dtstart="2015-07-02",
+                                    holidays=hols)),
+                         [datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 8, 0, 0)])
+        r = rrule(BDAILY, count=20, dtstart="2015-01-01",
+                  holidays=holidays.US())
+        self.assertEqual(r.count(), 20)
+        self.assertEqual(r[-1], datetime(2015, 1, 30, 0, 0))
+        self.assertEqual(list(rrule(BDAILY, count=0, dtstart="2015-07-02")),
+                         [])
+
+    def test_interval(self):
+        self.assertEqual(list(rrule(BDAILY, count=3, interval=2,
+                                    dtstart="2015-07-02")),
+                         [datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 6, 0, 0),
+                          datetime(2015, 7, 8, 0, 0)])
+
+    def test_byxxx(self):
+        self.assertEqual(list(rrule(BDAILY, count=3, byhour=(9, 12),
+                                    dtstart="2015-07-03 10:00")),
+                         [datetime(2015, 7, 3, 12, 0),
+                          datetime(2015, 7, 6, 9, 0),
+                          datetime(2015, 7, 6, 12, 0)])
+        self.assertEqual(list(rrule(BDAILY, count=3, bymonthday=(1, 4),
+                                    dtstart="2015-07-01")),
+                         [datetime(2015, 7, 1, 0, 0),
+                          datetime(2015, 8, 4, 0, 0),
+                          datetime(2015, 9, 1, 0, 0)])
+        # interval counts business days whether or not dates are selected
+        stepped = list(rrule(BDAILY, interval=5, count=4,
+                             dtstart="2015-01-02"))
+        self.assertEqual(stepped, [datetime(2015, 1, 2), datetime(2015, 1, 9),
+                                   datetime(2015, 1, 16),
+                                   datetime(2015, 1, 23)])
+        self.assertEqual(list(rrule(BDAILY, interval=5, count=4,
+                                    bymonth=(1, 2), dtstart="2015-01-02")),
+                         stepped)
+        self.assertEqual(list(rrule(BDAILY, interval=2, count=3,
+                                    byweekday=(MO, TU), dtstart="2015-01-02",
+                                    holidays=holidays.US())),
+                         [datetime(2015, 1, 6), datetime(2015, 1, 12),
+                          datetime(2015, 1, 27)])
+
+    def test_weekmask(self):
+        r = rrule(BDAILY, count=4, dtstart="2015-07-01",
+                  weekmask="Sun Mon Tue Wed Thu")
+        self.assertEqual(list(r), [datetime(2015, 7, 1, 0, 0),
+                                   datetime(2015, 7, 2, 0, 0),
+                                   datetime(2015, 7, 5, 0, 0),
+                                   datetime(2015, 7, 6, 0, 0)])
+        self.assertEqual(r[2], datetime(2015, 7, 5, 0, 0))
+        self.assertFalse(datetime(2015, 7, 3, 0, 0) in r)
+
+    def test_roll(self):
+        us = holidays.US()
+        self.assertEqual(list(rrule(MONTHLY, count=3, dtstart="2015-01-31",
+                                    bymonthday=-1, holidays=us,
+                                    roll="modifiedfollowing")),
+                         [datetime(2015, 1, 30, 0, 0),
+                          datetime(2015, 2, 27, 0, 0),
+                          datetime(2015, 3, 31, 0, 0)])
+        self.assertEqual(list(rrule(MONTHLY, count=3, dtstart="2015-05-04",
+                                    holidays=us, roll="following")),
+                         [datetime(2015, 5, 4, 0, 0),
+                          datetime(2015, 6, 4, 0, 0),
+                          datetime(2015, 7, 6, 0, 0)])
+        # until applies to the rolled dates
+        r = rrule(MONTHLY, dtstart="2015-05-04", until="2015-07-04",
+                  holidays=us, roll="preceding")
+        self.assertEqual(r.count(), 3)
+        self.assertEqual(r[-1], datetime(2015, 7, 2, 0, 0))
+        r = rrule(MONTHLY, dtstart="2015-05-04", until="2015-07-04",
+                  holidays=us, roll="following")
+        self.assertEqual(r[-1], datetime(2015, 6, 4, 0, 0))
+        # Occurrences rolled onto the same day only occur once
+        self.assertEqual(list(rrule(DAILY, count=3, dtstart="2015-07-02",
+                                    holidays=us, roll="following")),
+                         [datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 6, 0, 0),
+                          datetime(2015, 7, 7, 0, 0)])
+        self.assertRaises(ValueError,
+                          lambda: rrule(DAILY, roll="nearest"))
+
+    def test_bybday(self):
+        self.assertEqual(list(rrule(MONTHLY, count=3, dtstart="2015-01-01",
+                                    bybday=3, holidays=holidays.US())),
+                         [datetime(2015, 1, 6, 0, 0),
+                          datetime(2015, 2, 4, 0, 0),
+                          datetime(2015, 3, 4, 0, 0)])
+        self.assertEqual(list(rrule(MONTHLY, count=3, dtstart="2015-01-06",
+                                    bybday=(1, -1))),
+                         [datetime(2015, 1, 30, 0, 0),
+                          datetime(2015, 2, 2, 0, 0),
+                          datetime(2015, 2, 27, 0, 0)])
+        self.assertEqual(list(rrule(MONTHLY, dtstart="2015-01-01",
+                                    until="2015-12-31", bybday=-1,
+                                    bymonth=(3, 6, 9, 12))),
+                         [datetime(2015, 3, 31, 0, 0),
+                          datetime(2015, 6, 30, 0, 0),
+                          datetime(2015, 9, 30, 0, 0),
+                          datetime(2015, 12, 31, 0, 0)])
+        self.assertEqual(list(rrule(MONTHLY, count=2, interval=6,
+                                    dtstart="2015-01-01 09:30", bybday=-2)),
+                         [datetime(2015, 1, 29, 9, 30),
+                          datetime(2015, 7, 30, 9, 30)])
+        self.assertRaises(ValueError,
+                          lambda: rrule(DAILY, bybday=1))
+        self.assertRaises(ValueError,
+                          lambda: rrule(MONTHLY, bybday=(1, 0)))
+        for rule in ({'byweekday': MO}, {'bysetpos': 1}, {'bymonthday': 2},
+                     {'byyearday': 1}, {'byweekno': 1}):
+            self.assertRaises(ValueError,
+                              lambda: rrule(MONTHLY, bybday=1, **rule))
+
+    def test_bhourly(self):
+        self.assertEqual(list(rrule(BHOURLY, count=5,
+                                    dtstart="2015-07-02 14:30",
+                                    holidays=holidays.US())),
+                         [datetime(2015, 7, 2, 14, 30),
+                          datetime(2015, 7, 2, 15, 30),
+                          datetime(2015, 7, 2, 16, 30),
+                          datetime(2015, 7, 6, 9, 30),
+                          datetime(2015, 7, 6, 10, 30)])
+        # dtstart outside of business hours is rolled to the next opening
+        self.assertEqual(list(rrule(BHOURLY, interval=3,
+                                    dtstart="2015-07-03 20:00",
+                                    until="2015-07-07 10:00")),
+                         [datetime(2015, 7, 6, 9, 0),
+                          datetime(2015, 7, 6, 12, 0),
+                          datetime(2015, 7, 6, 15, 0),
+                          datetime(2015, 7, 7, 10, 0)])
+        self.assertEqual(list(rrule(BHOURLY, count=3,
+                                    dtstart="2015-07-02 14:00",
+                                    btstart=dt.time(8, 30),
+                                    btend=dt.time(16))),
+                         [datetime(2015, 7, 2, 14, 0),
+                          datetime(2015, 7, 2, 15, 0),
+                          datetime(2015, 7, 3, 8, 30)])
+        self.assertRaises(ValueError,
+                          lambda: rrule(BHOURLY, byhour=(9, 10)))
+
+    def test_bhourly_sessions(self):
+        lunch = [(dt.time(9), dt.time(11, 30)), (dt.time(13), dt.time(15))]
+        self.assertEqual(list(rrule(BHOURLY, count=4, sessions=lunch,
+                                    dtstart=datetime(2014, 1, 3, 10, 30))),
+                         [datetime(2014, 1, 3, 10, 30),
+                          datetime(2014, 1, 3, 13, 0),
+                          datetime(2014, 1, 3, 14, 0),
+                          datetime(2014, 1, 6, 9, 0)])
+
+    def test_bhourly_overnight(self):
+        self.assertEqual(list(rrule(BHOURLY, count=3, interval=4,
+                                    btstart=dt.time(22), btend=dt.time(6),
+                                    dtstart=datetime(2014, 1, 3, 23))),
+                         [datetime(2014, 1, 3, 23, 0),
+                          datetime(2014, 1, 4, 3, 0),
+                          datetime(2014, 1, 6, 23, 0)])
+
+    def test_bminutely(self):
+        r = rrule(BMINUTELY, interval=45, dtstart="2015-07-02 15:30",
+                  until="2015-07-06 10:00", holidays=holidays.US())
+        self.assertEqual(list(r), [datetime(2015, 7, 2, 15, 30),
+                                   datetime(2015, 7, 2, 16, 15),
+                                   datetime(2015, 7, 6, 9, 0),
+                                   datetime(2015, 7, 6, 9, 45)])
+        r = rrule(BMINUTELY, dtstart="2015-07-02 09:00",
+                  weekmask="Sun Mon Tue Wed Thu")
+        self.assertEqual(r[480], datetime(2015, 7, 5, 9, 0))
+
+    def test_getitem(self):
+        r = rrule(BDAILY, dtstart="2015-07-01", holidays=holidays.US())
+        self.assertEqual(r[0], datetime(2015, 7, 1, 0, 0))
+        self.assertEqual(r[2], datetime(2015, 7, 6, 0, 0))
+        self.assertEqual(r[1:6:2], [datetime(2015, 7, 2, 0, 0),
+                                    datetime(2015, 7, 7, 0, 0),
+                                    datetime(2015, 7, 9, 0, 0)])
+        r = rrule(BDAILY, dtstart="2015-07-01", until="2015-07-08",
+                  holidays=holidays.US())
+        self.assertEqual(r.count(), 5)
+        self.assertEqual(r[-1], datetime(2015, 7, 8, 0, 0))
+        self.assertRaises(IndexError, lambda: r[5])
+        self.assertEqual(r[3:], [datetime(2015, 7, 7, 0, 0),
+                                 datetime(2015, 7, 8, 0, 0)])
+
+    def test_contains(self):
+        r = rrule(BDAILY, count=10, dtstart="2015-07-01 09:00",
+                  holidays=holidays.US())
+        self.assertTrue(datetime(2015, 7, 2, 9, 0) in r)
+        self.assertFalse(datetime(2015, 7, 3, 9, 0) in r)
+        self.assertFalse(datetime(2015, 7, 2, 10, 0) in r)
+        self.assertFalse(datetime(2015, 7, 16, 9, 0) in r)
+        self.assertFalse(date(2015, 7, 2) in r)
+
+    def test_before_after(self):
+        r = rrule(BDAILY, count=10, dtstart="2015-07-01",
+                  holidays=holidays.US())
+        dt = datetime(2015, 7, 6, 0, 0)
+        self.assertEqual(r.before(dt), datetime(2015, 7, 2, 0, 0))
+        self.assertEqual(r.before(dt, inc=True), dt)
+        self.assertEqual(r.after(dt), datetime(2015, 7, 7, 0, 0))
+        self.assertEqual(r.after(dt, inc=True), dt)
+        self.assertEqual(r.before(datetime(2015, 7, 1, 0, 0)), None)
+        self.assertEqual(r.after(datetime(2015, 7, 15, 0, 0)), None)
+        self.assertEqual(r.between(datetime(2015, 7, 2, 0, 0), dt),
+                         [])
+        self.assertEqual(r.between(datetime(2015, 7, 2, 0, 0), dt,
+                                   inc=True),
+                         [datetime(2015, 7, 2, 0, 0), dt])
+
+    def test_calendar(self):
+        cal = BusinessCalendar(holidays.US(), years=range(2000, 2030))
+        r = rrule(BDAILY, dtstart="2000-01-03", holidays=cal)
+        self.assertEqual(r[5000], datetime(2019, 12, 5, 0, 0))
+        self.assertTrue(datetime(2019, 12, 5, 0, 0) in r)
+        self.assertFalse(datetime(2019, 12, 7, 0, 0) in r)
+
+
+class TestBusinessCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.cal = BusinessCalendar(holidays.US(), years=range(2010, 2020))
+
+    def test_isbday(self):
+        self.assertTrue(self.cal.isbday(date(2014, 1, 2)))
+        self.assertFalse(self.cal.isbday(date(2014, 1, 1)))
+        self.assertFalse(self.cal.isbday("2014-01-04"))
+        self.assertTrue(self.cal.isbday(datetime(2014, 7, 3, 17, 30)))
+        self.assertFalse(self.cal.isbday(datetime(2014, 7, 4, 17, 30)))
+        self.assertTrue(isbday(date(2014, 1, 2), holidays=self.cal))
+        self.assertFalse(isbday(date(2014, 1, 1), holidays=self.cal))
+        self.assertRaises(ValueError,
+                          lambda: self.cal.isbday(date(2020, 1, 1)))
+        self.assertRaises(ValueError,
+                          lambda: self.cal.isbday(date(2009, 12, 31)))
+
+    def test_contains(self):
+        self.assertTrue(date(2014, 1, 1) in self.cal)
+        self.assertFalse(date(2014, 1, 2) in self.cal)
+        self.assertFalse(date(2014, 1, 4) in self.cal)
+
+    def test_weekmask(self):
+        cal = BusinessCalendar(weekmask="Sun Mon Tue Wed Thu")
+        self.assertTrue(cal.isbday(date(2014, 1, 5)))
+        self.assertFalse(cal.isbday(date(2014, 1, 3)))
+        self.assertEqual(cal.weekmask,
+                         BusinessCalendar(weekmask="1111001").weekmask)
+        self.assertEqual(date(2014, 1, 2) + relativedelta(bdays=1,
+                                                          holidays=cal),
+                         date(2014, 1, 5))
+        self.assertEqual(relativedelta(date(2014, 1, 12), date(2014, 1, 1),
+                                       holidays=cal).bdays, 7)
+        self.assertRaises(ValueError, lambda: BusinessCalendar(weekmask="abc"))
+        self.assertRaises(ValueError,
+                          lambda: BusinessCalendar(weekmask="0000000"))
+
+    def test_relativedelta(self):
+        self.assertEqual(date(2014, 7, 3) + relativedelta(bdays=+2,
+                                                          holidays=self.cal),
+                         date(2014, 7, 8))
+        self.assertEqual(relativedelta(datetime(2015, 1, 20, 21, 22),
+                                       datetime(2015, 1, 9, 3, 0),
+                                       holidays=self.cal),
+                         relativedelta(days=11, hours=18, minutes=22,
+                                       bdays=6, bhours=8, bminutes=0))
+        self.assertEqual(relativedelta(date(2019, 12, 31), date(2010, 1, 1),
+                                       holidays=self.cal),
+                         relativedelta(date(2019, 12, 31), date(2010, 1, 1),
+                                       holidays=holidays.US()))
+        self.assertEqual(date(2010, 1, 4)
+                         + relativedelta(bdays=+2000, holidays=self.cal),
+                         date(2010, 1, 4)
+                         + relativedelta(bdays=+2000, holidays=holidays.US()))
+        self.assertEqual(date(2019, 12, 31)
+                         - relativedelta(bdays=+2000, holidays=self.cal),
+                         date(2019, 12, 31)
+                         - relativedelta(bdays=+2000, holidays=holidays.US()))
+        self.assertRaises(ValueError,
+                          lambda: date(2019, 12, 31)
+                          + relativedelta(bdays=+1, holidays=self.cal))
+
+    def test_boundaries(self):
+        # The first and last days of the calendar can be rolled from
+        cal = BusinessCalendar(years=2014)
+        self.assertEqual(date(2014, 1, 1) + relativedelta(bdays=0,
+                                                          holidays=cal),
+                         date(2014, 1, 1))
+        self.assertEqual(date(2014, 1, 1) + relativedelta(bdays=1,
+                                                          holidays=cal),
+                         date(2014, 1, 2))
+        self.assertEqual(date(2014, 12, 31) - relativedelta(bdays=0,
+                                                            holidays=cal),
+                         date(2014, 12, 31))
+        self.assertEqual(date(2014, 12, 31) - relativedelta(bdays=1,
+                                                            holidays=cal),
+                         date(2014, 12, 30))
+        self.assertEqual(roll(date(2014, 1, 1), holidays=cal),
+                         date(2014, 1, 1))
+        self.assertEqual(roll(date(2014, 12, 31), "preceding", holidays=cal),
+                         date(2014, 12, 31))
+        self.assertEqual(list(rrule(BDAILY, count=2, dtstart=date(2014, 1, 1),
+                                    holidays=cal)),
+                         [datetime(2014, 1, 1, 0, 0),
+                          datetime(2014, 1, 2, 0, 0)])
+        self.assertEqual(list(rrule(BDAILY, count=2,
+                                    dtstart=date(2014, 12, 30),
+                                    holidays=cal)),
+                         [datetime(2014, 12, 30, 0, 0),
+                          datetime(2014, 12, 31, 0, 0)])
+        self.assertRaises(ValueError,
+                          lambda: date(2014, 12, 31)
+                          + relativedelta(bdays=+1, holidays=cal))
+        self.assertRaises(ValueError,
+                          lambda: date(2014, 1, 1)
+                          - relativedelta(bdays=+1, holidays=cal))
+
+    def test_rrule(self):
+        self.assertEqual(list(rrule(BDAILY, count=4, dtstart="2015-07-01",
+                                    holidays=self.cal)),
+                         [datetime(2015, 7, 1, 0, 0),
+                          datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 6, 0, 0),
+                          datetime(2015, 7, 7, 0, 0)])
+
+    def test_combine(self):
+        uk = BusinessCalendar(holidays.UK(), years=range(2012, 2025))
+        both = self.cal & uk
+        self.assertEqual(repr(both),
+                         "BusinessCalendar(weekmask='1111100', "
+                         "years=range(2012, 2020))")
+        self.assertTrue(both.isbday(date(2014, 7, 3)))
+        self.assertFalse(both.isbday(date(2014, 7, 4)))
+        self.assertFalse(both.isbday(date(2014, 5, 5)))
+        either = self.cal | uk
+        self.assertTrue(either.isbday(date(2014, 7, 4)))
+        self.assertTrue(either.isbday(date(2014, 5, 5)))
+        self.assertFalse(either.isbday(date(2014, 12, 25)))
+        self.assertFalse(either.isbday(date(2014, 12, 27)))
+        only_us = self.cal - uk
+        self.assertFalse(only_us.isbday(date(2014, 7, 3)))
+        self.assertFalse(only_us.isbday(date(2014, 7, 4)))
+        self.assertTrue(only_us.isbday(date(2014, 5, 5)))
+        self.assertTrue(date(2014, 5, 5) in both)
+        self.assertFalse(date(2014, 5, 5) in only_us)
+        self.assertTrue(isbday(date(2014, 5, 6), holidays=both))
+        self.assertEqual(date(2014, 5, 2) + relativedelta(bdays=1,
+                                                          holidays=both),
+                         date(2014, 5, 6))
+        self.assertEqual(list(rrule(BDAILY, count=2, dtstart="2014-07-01",
+                                    holidays=only_us)),
+                         [datetime(2014, 12, 26, 0, 0),
+                          datetime(2015, 4, 3, 0, 0)])
+        self.assertRaises(ValueError,
+                          lambda: self.cal & BusinessCalendar(years=2020))
+        self.assertRaises(TypeError, lambda: self.cal & [date(2014, 1, 1)])
+
+    def test_combine_weekmask(self):
+        sun_thu = BusinessCalendar(weekmask="Sun Mon Tue Wed Thu",
+                                   years=range(2010, 2020))
+        self.assertEqual((self.cal & sun_thu).weekmask,
+                         (True, True, True, True, False, False, False))
+        self.assertEqual((self.cal | sun_thu).weekmask,
+                         (True, True, True, True, True, False, True))
+        self.assertTrue((self.cal | sun_thu).isbday(date(2014, 7, 3)))
+        self.assertFalse((self.cal | sun_thu).isbday(date(2014, 7, 4)))
+        self.assertTrue((self.cal | sun_thu).isbday(date(2014, 7, 6)))
+        self.assertTrue((self.cal & sun_thu).isbday(date(2014, 7, 3)))
+        self.assertFalse((self.cal & sun_thu).isbday(date(2014, 7, 6)))
+
+    def test_sessions(self):
+        # Early close the day before Independence Day, the sessions of the
+        # holiday itself are dropped
+        early = [(dt.time(9), dt.time(13))]
+        cal = BusinessCalendar(holidays.US(), years=range(2010, 2020),
+                               sessions={date(2014, 7, 3): early,
+                                         "2014-07-04": early})
+        self.assertEqual(cal.sessions, {date(2014, 7, 3): early})
+        self.assertEqual("2014-07-03 12:00"
+                         + relativedelta(bhours=+2, holidays=cal),
+                         datetime(2014, 7, 7, 10, 0))
+        self.assertEqual("2014-07-03 14:00"
+                         + relativedelta(bhours=+2, holidays=cal),
+                         datetime(2014, 7, 7, 11, 0))
+        self.assertEqual("2014-07-02 16:00"
+                         + relativedelta(bhours=+6, holidays=cal),
+                         datetime(2014, 7, 7, 10, 0))
+        self.assertEqual("2014-07-07 10:00"
+                         + relativedelta(bhours=-2, holidays=cal),
+                         datetime(2014, 7, 3, 12, 0))
+        self.assertEqual("2014-06-30 09:00"
+                         + relativedelta(bhours=+40, holidays=cal),
+                         datetime(2014, 7, 8, 13, 0))
+        self.assertEqual("2014-07-08 13:00"
+                         + relativedelta(bhours=-40, holidays=cal),
+                         datetime(2014, 6, 30, 9, 0))
+        self.assertEqual("2014-01-02 09:00"
+                         + relativedelta(bhours=+8 * 400, holidays=cal),
+                         "2014-01-02 09:00"
+                         + relativedelta(bhours=+8 * 400 + 4,
+                                         holidays=self.cal))
+        self.assertEqual(relativedelta("2014-07-03 15:00", "2014-07-03 10:00",
+                                       holidays=cal),
+                         relativedelta(hours=+5, bhours=+3))
+        self.assertEqual(list(rrule(BHOURLY, count=3, interval=2,
+                                    holidays=cal,
+                                    dtstart=datetime(2014, 7, 3, 11))),
+                         [datetime(2014, 7, 3, 11, 0),
+                          datetime(2014, 7, 7, 9, 0),
+                          datetime(2014, 7, 7, 11, 0)])
+        self.assertEqual((cal | self.cal).sessions, cal.sessions)
+        self.assertEqual((self.cal - cal).sessions, {})
+        self.assertRaises(ValueError,
+                          lambda: BusinessCalendar(
+                              sessions={date(2014, 7, 3):
+                                        [(dt.time(9), dt.time(13)),
+                                         (dt.time(12), dt.time(14))]}))
+        self.assertRaises(ValueError,
+                          lambda: BusinessCalendar(
+                              sessions={date(2014, 7, 2):
+                                        [(dt.time(22), dt.time(2))],
+                                        date(2014, 7, 3):
+                                        [(dt.time(1), dt.time(5))]}))
+        # Overrides must not run into the weekday sessions around them
+        allday = [(dt.time(0), dt.time(0))]
+        cal = BusinessCalendar(sessions={date(2014, 7, 3):
+                                         [(dt.time(10), dt.time(11)),
+                                          (dt.time(23), dt.time(1))]})
+        self.assertRaises(ValueError, lambda: "2014-07-03 10:00" +
+                          relativedelta(bhours=+1, sessions=allday,
+                                        holidays=cal))
+        self.assertEqual("2014-07-03 10:00" + relativedelta(bhours=+1,
+                                                            holidays=cal),
+                         datetime(2014, 7, 3, 23, 0))
+        self.assertRaises(ValueError, lambda: "2014-07-03 10:00" +
+                          relativedelta(bhours=+1, sessions=allday,
+                                        holidays=cal))
+        self.assertRaises(ValueError, lambda: "2014-07-03 10:00" +
+                          relativedelta(bhours=+1, holidays=cal,
+                                        sessions=[(dt.time(20),
+                                                   dt.time(11))]))
+        cal = BusinessCalendar(sessions={date(2014, 7, 3):
+                                         [(dt.time(0), dt.time(13))]})
+        self.assertEqual("2014-07-03 12:00" +
+                         relativedelta(bhours=+2, sessions=allday,
+                                       holidays=cal),
+                         datetime(2014, 7, 4, 1, 0))
+
+
+class TestFrozenHolidays(unittest.TestCase):
+
+    def setUp(self):
+        self.hols = freeze_holidays(holidays.US(), years=range(2010, 2020))
+
+    def test_freeze(self):
+        self.assertTrue(isinstance(self.hols, FrozenHolidays))
+        self.assertEqual(len(self.hols), len(holidays.US(years=range(2010,
+                                                                     2020))))
+        self.assertTrue(date(2014, 1, 1) in self.hols)
+        self.assertTrue(datetime(2014, 7, 4, 12, 30) in self.hols)
+        self.assertTrue("2014-12-25" in self.hols)
+        self.assertFalse(date(2014, 1, 2) in self.hols)
+        self.assertFalse(date(2020, 1, 1) in self.hols)
+        self.assertTrue(freeze_holidays(self.hols) is self.hols)
+        hols = freeze_holidays([date(2014, 1, 1), "2014-12-25"])
+        self.assertEqual(list(hols), [date(2014, 1, 1), date(2014, 12, 25)])
+        self.assertEqual(hols, freeze_holidays(["2014-12-25", "2014-01-01"]))
+
+    def test_isbday(self):
+        self.assertFalse(isbday(date(2014, 1, 1), holidays=self.hols))
+        self.assertTrue(isbday(date(2014, 1, 2), holidays=self.hols))
+
+    def test_relativedelta(self):
+        self.assertEqual(date(2014, 7, 3) + relativedelta(bdays=+2,
+                                                          holidays=self.hols),
+                         date(2014, 7, 8))
+        self.assertEqual(relativedelta(date(2015, 1, 1), date(2014, 1, 1),
+                                       holidays=self.hols).bdays, 252)
+
+    def test_rrule(self):
+        self.assertEqual(list(rrule(BDAILY, dtstart="2015-07-02",
+                                    until="2015-07-06", holidays=self.hols)),
+                         [datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 6, 0, 0)])
+        self.assertEqual(list(rrule(BDAILY, dtstart="2015-07-02", count=2,
+                                    holidays=self.hols)),
+                         [datetime(2015, 7, 2, 0, 0),
+                          datetime(2015, 7, 6, 0, 0)])
+
+    def test_calendar(self):
+        cal = BusinessCalendar(self.hols, years=range(2010, 2020))
+        self.assertFalse(cal.isbday(date(2014, 7, 4)))
+        self.assertTrue(cal.isbday(date(2014, 7, 3)))
+
+
+@requires_numpy
+class TestIsBdayArray(unittest.TestCase):
+
+    def test_isbday_array(self):
+        dates = np.array(["2014-01-01", "2014-01-03", "2014-01-04",
+                          "2014-07-04", "NaT"], dtype="datetime64[D]")
+        self.assertEqual(isbday_array(dates).tolist(),
+                         [True, True, False, True, False])
+        self.assertEqual(isbday_array(dates, holidays=holidays.US()).tolist(),
+                         [False, True, False, False, False])
+        cal = BusinessCalendar(holidays.US(), years=range(2010, 2020))
+        self.assertEqual(isbday_array(dates, holidays=cal).tolist(),
+                         [False, True, False, False, False])
+        hols = freeze_holidays(holidays.US(), years=2014)
+        self.assertEqual(isbday_array(dates, holidays=hols).tolist(),
+                         [False, True, False, False, False])
+        self.assertEqual(isbday_array(dates, weekmask="0111110").tolist(),
+                         [True, True, True, True, False])
+        self.assertRaises(ValueError,
+                          lambda: isbday_array(["2020-01-01"], holidays=cal))
+
+    def test_conversion(self):
+        self.assertEqual(isbday_array(["2014-01-01", "1/4/2014",
+                                       date(2014, 7, 4),
+                                       datetime(2014, 1, 6, 12)],
+                                      holidays=holidays.US()).tolist(),
+                         [False, False, False, True])
+        dates = np.array(["2014-01-03T23:59", "2014-01-04T00:00"],
+                         dtype="datetime64[s]")
+        self.assertEqual(isbday_array(dates).tolist(), [True, False])
+        self.assertEqual(isbday_array(dates.reshape(2, 1)).shape, (2, 1))
+        self.assertEqual(isbday_array([]).tolist(), [])
+        self.assertFalse(isbday_array("2014-01-04"))
+
+    def test_isbday(self):
+        dates = [date(2014, 1, 1) + relativedelta(days=i)
+                 for i in range(-400, 400)]
+        for hols in ((), holidays.US(), holidays.CA()):
+            self.assertEqual(isbday_array(dates, holidays=hols).tolist(),
+                             [isbday(dt, holidays=hols) for dt in dates])
+
+
+@requires_numpy
+class TestBdaysArray(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = [date(2014, 1, 1) + relativedelta(days=i)
+                      for i in range(-60, 60, 3)]
+        self.others = [date(2014, 1, 1) + relativedelta(days=i)
+                       for i in range(-100, 100, 5)]
+        self.cal = BusinessCalendar(holidays.US(), years=range(2010, 2020))
+
+    def test_add_bdays(self):
+        dates = np.array(["2014-01-03", "2014-01-04", "NaT"],
+                         dtype="datetime64[D]")
+        self.assertEqual(add_bdays(dates, 1).tolist(),
+                         [date(2014, 1, 6), date(2014, 1, 7), None])
+        self.assertEqual(add_bdays(dates, 0).tolist(),
+                         [date(2014, 1, 3), date(2014, 1, 6), None])
+        self.assertEqual(add_bdays(dates[:2], [[1], [-1]]).tolist(),
+                         [[date(2014, 1, 6), date(2014, 1, 7)],
+                          [date(2014, 1, 2), date(2014, 1, 3)]])
+        dates = np.array(["2014-07-03T12:30"], dtype="datetime64[m]")
+        self.assertEqual(add_bdays(dates, 1, holidays=self.cal).tolist(),
+                         [datetime(2014, 7, 7, 12, 30)])
+        self.assertEqual(add_bdays(["2014-07-03 12:30"], 1,
+                                   holidays=holidays.US()).tolist(),
+                         [datetime(2014, 7, 7, 12, 30)])
+        for hols in ((), holidays.US(), self.cal):
+            for n in (-25, -1, 0, 1, 25):
+                self.assertEqual(add_bdays(self.dates, n,
+                                           holidays=hols).tolist(),
+                                 [dt + relativedelta(bdays=n, holidays=hols)
+                                  for dt in self.dates])
+
+    def test_sub_bdays(self):
+        dates = np.array(["2014-01-03", "2014-01-04"], dtype="datetime64[D]")
+        self.assertEqual(sub_bdays(dates, 0).tolist(),
+                         [date(2014, 1, 3), date(2014, 1, 3)])
+        self.assertEqual(sub_bdays(dates, 1).tolist(),
+                         [date(2014, 1, 2), date(2014, 1, 3)])
+        for hols in ((), holidays.US(), self.cal):
+            for n in (-25, -1, 0, 1, 25):
+                self.assertEqual(sub_bdays(self.dates, n,
+                                           holidays=hols).tolist(),
+                                 [dt - relativedelta(bdays=n, holidays=hols)
+                                  for dt in self.dates])
+
+    def test_count_bdays(self):
+        self.assertEqual(count_bdays("2014-01-03", ["2014-01-07",
+                                                    "2014-01-01"]).tolist(),
+                         [2, -2])
+        self.assertEqual(count_bdays(["2014-01-04 09:00"],
+                                     ["2014-01-06 08:00"]).tolist(), [1])
+        self.assertRaises(ValueError,
+                          lambda: count_bdays(np.array(["NaT"],
+                                                       dtype="datetime64[D]"),
+                                              "2014-01-01"))
+        for hols in ((), holidays.US(), self.cal):
+            self.assertEqual(count_bdays(np.array(self.dates)[:, None],
+                                         self.others, holidays=hols).tolist(),
+                             [[relativedelta(dt2, dt1, holidays=hols).bdays
+                               for dt2 in self.others]
+                              for dt1 in self.dates])
+
+
+class TestBusinessSeconds(unittest.TestCase):
+
+    def test_business_seconds(self):
+        self.assertEqual(business_seconds("2014-01-03 16:00",
+                                          "2014-01-06 10:00"), 7200)
+        self.assertEqual(business_seconds("2014-01-06 10:00",
+                                          "2014-01-03 16:00"), -7200)
+        self.assertEqual(business_seconds("2014-01-04", "2014-01-05"), 0)
+        self.assertEqual(business_seconds(date(2014, 1, 3),
+                                          date(2014, 1, 10)), 5 * 8 * 3600)
+        self.assertEqual(business_seconds("2013-12-31 12:00",
+                                          "2014-01-02 12:00",
+                                          holidays.US()), 8 * 3600)
+        self.assertEqual(business_seconds("2014-01-02 09:00:00.5",
+                                          "2014-01-02 09:00:02"), 1)
+        self.assertEqual(business_seconds("2014-01-02 09:00",
+                                          "2014-01-03 09:00",
+                                          btstart=dt.time(8),
+                                          btend=dt.time(18)), 10 * 3600)
+        lunch = [(dt.time(9), dt.time(11, 30)), (dt.time(13), dt.time(15))]
+        self.assertEqual(business_seconds("2014-01-02 11:00",
+                                          "2014-01-06 14:00",
+                                          sessions=lunch),
+                         int(10.5 * 3600))
+        self.assertEqual(business_seconds("2014-01-03 23:00",
+                                          "2014-01-07 01:00",
+                                          btstart=dt.time(22),
+                                          btend=dt.time(6)), 10 * 3600)
+
+    def test_relativedelta(self):
+        # Landing on the end of business time is its next opening time
+        start = datetime(2013, 12, 20, 10, 17)
+        for bhours in (1, 7, 8, 30, 250):
+            end = start + relativedelta(bhours=bhours, bminutes=5,
+                                        holidays=holidays.US())
+            self.assertEqual(business_seconds(start, end, holidays.US()),
+                             (bhours * 60 + 5) * 60)
+
+    def test_calendar(self):
+        cal = BusinessCalendar(holidays.US(), years=range(2010, 2020),
+                               sessions={"2014-07-03": [(dt.time(9),
+                                                         dt.time(13))]})
+        self.assertEqual(business_seconds("2014-06-30", "2014-07-08", cal),
+                         (3 * 8 + 4 + 8) * 3600)
+        self.assertEqual(business_seconds("2010-01-01", "2019-12-31", cal),
+                         business_seconds("2010-01-01", "2019-12-31",
+                                          holidays.US()) - 4 * 3600)
+
+    @requires_numpy
+    def test_array(self):
+        cal = BusinessCalendar(holidays.US(), years=range(2010, 2020),
+                               sessions={"2014-07-03": [(dt.time(9),
+                                                         dt.time(13))]})
+        start = [datetime(2014, 6, 1) + relativedelta(hours=i * 7)
+                 for i in range(200)]
+        end = [datetime(2014, 7, 10) - relativedelta(hours=i * 5)
+               for i in range(200)]
+        for hols in ((), holidays.US(), cal):
+            ret = business_seconds_array(np.array(start, dtype="M8[s]"),
+                                         np.array(end, dtype="M8[s]"), hols)
+            self.assertEqual(ret.dtype, np.int64)
+            self.assertEqual(ret.tolist(),
+                             [business_seconds(s, e, hols)
+                              for s, e in zip(start, end)])
+        self.assertEqual(business_seconds(["2014-01-03 16:00"],
+                                          "2014-01-06 10:00").tolist(),
+                         [7200])
+        self.assertRaises(ValueError,
+                          lambda: business_seconds_array(
+                              np.array(["NaT"], dtype="M8[s]"),
+                              np.array(["2014-01-01"], dtype="M8[s]")))
+
+
+@requires_numpy
+class TestAddBusinessTime(unittest.TestCase):
+
+    def test_add_business_time(self):
+        dates = np.array(["2014-01-03T16:00", "2014-01-04T12:00", "NaT"],
+                         dtype="datetime64[m]")
+        ret = add_business_time(dates, 3600)
+        self.assertEqual(ret.dtype, np.dtype("datetime64[us]"))
+        self.assertEqual(ret[:2].tolist(), [datetime(2014, 1, 6, 9, 0),
+                                            datetime(2014, 1, 6, 10, 0)])
+        self.assertTrue(np.isnat(ret[2]))
+        self.assertEqual(add_business_time(dates[:2], [-3600, 1.5]).tolist(),
+                         [datetime(2014, 1, 3, 15, 0),
+                          datetime(2014, 1, 6, 9, 0, 1, 500000)])
+        self.assertEqual(add_business_time(
+            (d for d in ["2014-07-03 16:00", date(2014, 7, 3)]), 8 * 3600,
+            holidays.US()).tolist(),
+            [datetime(2014, 7, 7, 16, 0), datetime(2014, 7, 7, 9, 0)])
+        self.assertEqual(add_business_time([], 3600).tolist(), [])
+
+    def test_relativedelta(self):
+        cal = BusinessCalendar(holidays.US(), years=range(2010, 2020),
+                               sessions={"2014-07-03": [(dt.time(9),
+                                                         dt.time(13))]})
+        lunch = [(dt.time(9), dt.time(11, 30)), (dt.time(13), dt.time(15))]
+        week = {MO: lunch, WE: [(dt.time(22), dt.time(6))]}
+        dates = [datetime(2014, 6, 1) + relativedelta(minutes=i * 437)
+                 for i in range(150)]
+        seconds = [(i * 7919) % 200000 - 100000 for i in range(150)]
+        for kwargs in ({}, {"holidays": holidays.US()}, {"holidays": cal},
+                       {"holidays": cal, "sessions": lunch},
+                       {"sessions": week},
+                       {"holidays": holidays.US(), "sessions": week},
+                       {"holidays": cal, "sessions": week},
+                       {"btstart": dt.time(22), "btend": dt.time(6)}):
+            self.assertEqual(add_business_time(dates, seconds,
+                                               **kwargs).tolist(),
+                             [d + relativedelta(bseconds=s, **kwargs)
+                              for d, s in zip(dates, seconds)])
+        # Business days of different lengths over long spans
+        seconds = [s * 97 for s in seconds]
+        for kwargs in ({"holidays": holidays.US(), "sessions": week},
+                       {"holidays": cal, "sessions": week}):
+            self.assertEqual(add_business_time(dates, seconds,
+                                               **kwargs).tolist(),
+                             [d + relativedelta(bseconds=s, **kwargs)
+                              for d, s in zip(dates, seconds)])
+
 
 class TestDateTime(unittest.TestCase):
 